@@ -3,6 +3,11 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The note event stream (main.views.note_events) is an async view holding its
+connection open, serve it with an ASGI server (e.g. uvicorn core.asgi:application)
+so an idle stream doesn't tie up a worker thread. DisconnectMiddleware ends the
+stream once its client goes away.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -11,6 +16,8 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from main.helpers.events_helper import DisconnectMiddleware
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+application = DisconnectMiddleware(get_asgi_application())
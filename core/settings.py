@@ -87,6 +87,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+# the note event stream holds its connection open, serve it through ASGI
+ASGI_APPLICATION = "core.asgi.application"
 
 
 # Database
@@ -169,6 +171,67 @@ SIMPLE_JWT = {
     "USER_ID_FIELD": "id",
 }
 
+# Cache
+# the default cache is local to each process, state every worker has to agree on
+# (e.g. the note list pages and versions) lives in the shared cache on Redis
+SHARED_CACHE_URL = config("SHARED_CACHE_URL", default="redis://127.0.0.1:6379/1")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": SHARED_CACHE_URL,
+    },
+}
+# seconds a serialized note list page is kept, writes make it stale earlier
+NOTE_LIST_CACHE_TIMEOUT = 5 * 60
+# seconds a serialized diary note stays in the cache, saves and deletes invalidate it earlier
+NOTE_DETAIL_CACHE_TIMEOUT = 60 * 60
+# seconds a process trusts its in-memory categories before checking the shared version
+CATEGORY_REGISTRY_CHECK_INTERVAL = 30
+# seconds the first response to an Idempotency-Key is replayed for
+IDEMPOTENCY_KEY_TIMEOUT = 60 * 60
+
+# Request bodies
+# largest request body accepted once a gzip / zstd Content-Encoding is decoded, in bytes
+REQUEST_BODY_MAX_DECOMPRESSED_SIZE = 10 * 1024 * 1024
+
+# Trash
+# days a trashed diary note is kept before the purge task deletes it
+NOTE_TRASH_RETENTION_DAYS = 30
+# notes deleted per statement by the purge task
+NOTE_TRASH_PURGE_CHUNK_SIZE = 500
+
+# Sync
+# days deleted notes are remembered for the delta sync endpoint, older sync tokens
+# need a full sync
+NOTE_DELETION_LOG_RETENTION_DAYS = 90
+# notes and tombstones returned per delta sync page
+NOTE_SYNC_PAGE_SIZE = 100
+# seconds of changes every delta sync sends again, longer than a write takes to
+# commit so a note stamped before a sync but committed after it is not skipped
+NOTE_SYNC_SAFETY_LAG = 10
+
+# Events
+# broker class fanning note and reminder change events out to the SSE streams,
+# RedisBroker reaches the streams of every worker, InProcessBroker only those of
+# the worker making the change
+NOTE_EVENTS_BROKER = "main.helpers.events_helper.RedisBroker"
+NOTE_EVENTS_REDIS_URL = config(
+    "NOTE_EVENTS_REDIS_URL", default="redis://127.0.0.1:6379"
+)
+# seconds between keep-alive comments on an idle event stream
+NOTE_EVENTS_HEARTBEAT_INTERVAL = 15
+# events queued per stream before a slow client is told to resync
+NOTE_EVENTS_QUEUE_SIZE = 100
+
+# Dashboard
+# upcoming notes and reminders the dashboard returns by default
+DASHBOARD_UPCOMING_LIMIT = 5
+# most upcoming notes and reminders a client can ask the dashboard for
+DASHBOARD_UPCOMING_MAX_LIMIT = 50
+
 # Mailgun
 MAILGUN_API_KEY = config("MAILGUN_API_KEY")
 
@@ -181,6 +244,3 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_RESULT_BACKEND = "django-db"
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
-
-
-
@@ -5,4 +5,17 @@ DATABASES = {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
     }
-}
\ No newline at end of file
+}
+
+# the tests run in one process, a local shared cache keeps cache reads out of the
+# query counts, tests that need a cache shared between workers override CACHES
+CACHES = {
+    **CACHES,
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'shared',
+    },
+}
+
+# no Redis in the tests, the streams and the changes share a process
+NOTE_EVENTS_BROKER = 'main.helpers.events_helper.InProcessBroker'
@@ -14,6 +14,7 @@ class CategoryResource(resources.ModelResource):
 class DiaryNoteResource(resources.ModelResource):
     class Meta:
         model = DiaryNote
+        exclude = ("search_vector",)
 
 
 class NoteReminderResource(resources.ModelResource):
@@ -64,7 +65,11 @@ class DiaryNoteResourceAdmin(ImportExportModelAdmin):
     date_hierarchy = "created_at"
 
     def get_list_display(self, request):
-        return [field.name for field in self.model._meta.concrete_fields]
+        return [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if field.name != "search_vector"
+        ]
 
 
 class NoteReminderResourceAdmin(ImportExportModelAdmin):
@@ -1,6 +1,23 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_note_search_schema(sender, using, **kwargs):
+    from django.db import connections
+
+    from main.helpers.search_helper import install_search_schema
+
+    install_search_schema(connections[using])
 
 
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        import main.signals  # noqa: F401
+
+        # the search index lives outside the model state (triggers, FTS5 table),
+        # recreate it after every migrate so databases built without migrations
+        # (e.g. the test database) get it too
+        post_migrate.connect(install_note_search_schema, sender=self)
@@ -0,0 +1,23 @@
+def set_postgres_column_compression(schema_editor, model, field_name, method="lz4"):
+    """
+    Switch the TOAST compression of a PostgreSQL column, a no-op elsewhere
+
+    Description:
+        - needs PostgreSQL 14+ built with lz4, older servers keep pglz
+        - only values written afterwards use the new method
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql" or connection.pg_version < 140000:
+        return
+
+    table = schema_editor.quote_name(model._meta.db_table)
+    column = schema_editor.quote_name(model._meta.get_field(field_name).column)
+    schema_editor.execute(f"""
+        DO $$
+        BEGIN
+            ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION {method};
+        EXCEPTION WHEN feature_not_supported THEN
+            RAISE NOTICE 'compression method {method} is not available';
+        END
+        $$
+        """)
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.http import parse_etags
+
+
+def note_cache_key(note_id):
+    return f"diary_note:{note_id}"
+
+
+# cache alias of what every worker has to see the same, e.g. the cached notes, the
+# note list versions and the note list pages keyed by them
+SHARED_CACHE_ALIAS = "shared"
+
+
+def note_list_version_key(user_id):
+    return f"note_list_version:{user_id}"
+
+
+def note_list_cache_key(user_id, etag):
+    tag = strip_weak(etag).strip('"')
+    return f"note_list:{user_id}:{tag}"
+
+
+def compute_etag(data):
+    """
+    Strong ETag of a serialized representation
+
+    Args:
+        data (dict): serializer data
+
+    Returns:
+        str: quoted ETag
+    """
+    encoded = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode("utf-8")
+    return f'"{hashlib.md5(encoded).hexdigest()}"'
+
+
+def compute_list_etag(request, *versions):
+    """
+    Weak ETag of a list response, computed without building the list
+
+    Args:
+        request (Request): current request, the path and query string are part of
+            the ETag so every page, filter and sort has its own
+        *versions: change markers of everything the response is built from
+
+    Returns:
+        str: quoted weak ETag
+    """
+    payload = [request.path, sorted(request.GET.lists()), versions]
+    encoded = json.dumps(payload, cls=DjangoJSONEncoder).encode("utf-8")
+    return f'W/"{hashlib.md5(encoded).hexdigest()}"'
+
+
+def strip_weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(request, etag):
+    """
+    Check the If-None-Match request header against an ETag, with the weak
+    comparison If-None-Match calls for
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+
+    etags = parse_etags(header)
+    return "*" in etags or strip_weak(etag) in {strip_weak(tag) for tag in etags}
+
+
+def get_cached_note(note_id, versions):
+    """
+    Get the cached representation of a diary note
+
+    Args:
+        note_id (int): id of the note
+        versions (list): change markers of what the note is serialized with besides
+            itself (e.g. the owner and the categories), an entry cached under other
+            markers is stale
+
+    Returns:
+        dict: {"owner_id", "versions", "etag", "data"} or None on a cache miss
+    """
+    entry = caches[SHARED_CACHE_ALIAS].get(note_cache_key(note_id))
+    if entry is None or entry["versions"] != versions:
+        return None
+    return entry
+
+
+def cache_note(note, data, versions):
+    """
+    Cache the serialized representation of a diary note
+
+    Args:
+        note (DiaryNote): DiaryNote object
+        data (dict): DiaryNoteSerializer data
+        versions (list): change markers the data was serialized under
+
+    Returns:
+        dict: the cache entry
+    """
+    entry = {
+        "owner_id": note.owner_id,
+        "versions": versions,
+        "etag": compute_etag(data),
+        "data": data,
+    }
+    caches[SHARED_CACHE_ALIAS].set(
+        note_cache_key(note.id), entry, settings.NOTE_DETAIL_CACHE_TIMEOUT
+    )
+    return entry
+
+
+def invalidate_note(*note_ids):
+    """
+    Drop cached diary notes, now and again once the transaction commits
+
+    The entries live in the shared cache so every worker stops serving them, the
+    second drop removes what a concurrent request cached before the commit.
+    """
+    keys = [note_cache_key(note_id) for note_id in note_ids]
+
+    def invalidate():
+        caches[SHARED_CACHE_ALIAS].delete_many(keys)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def get_note_list_version(user_id):
+    """
+    Version of a user's diary notes, it changes whenever one of them is written
+
+    The version is kept in the shared cache, a write made by one worker changes the
+    version every worker reads.
+
+    Returns:
+        int: version, a fresh unique one when the key is missing so a version is
+        never handed out twice
+    """
+    return caches[SHARED_CACHE_ALIAS].get_or_set(
+        note_list_version_key(user_id), time.time_ns, timeout=None
+    )
+
+
+def bump_note_list_version(*user_ids):
+    """
+    Move the users' note list version on, now and again once the transaction commits
+
+    The first bump makes the write visible at once, e.g. to the rest of the
+    transaction, the second one drops what a concurrent request read and cached
+    before the commit.
+    """
+    user_ids = set(user_ids)
+
+    def bump():
+        for user_id in user_ids:
+            try:
+                caches[SHARED_CACHE_ALIAS].incr(note_list_version_key(user_id))
+            except ValueError:
+                # the key expired or was evicted, the next read starts a new version
+                pass
+
+    bump()
+    transaction.on_commit(bump)
+
+
+class NoteListCache:
+    """
+    Serialized note list pages of each user
+
+    Pages are keyed by the list ETag, which covers the query string (filter, sort,
+    page, ...) and the user's note list version. Writes bump the version instead of
+    deleting pages, the stale pages are simply never read again and expire after
+    NOTE_LIST_CACHE_TIMEOUT seconds.
+
+    The backend is the shared cache, a page written by one worker is served by the
+    others and a write made through any worker makes it stale everywhere. Hits and
+    misses are counted per process.
+    """
+
+    def __init__(self, alias=SHARED_CACHE_ALIAS):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, user_id, etag):
+        """
+        Get a cached list page
+
+        Args:
+            user_id (int): id of the user the page belongs to
+            etag (str): ETag of the list response
+
+        Returns:
+            dict: the response data, None on a miss
+        """
+        data = self.cache.get(note_list_cache_key(user_id, etag))
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return data
+
+    def set(self, user_id, etag, data):
+        self.cache.set(
+            note_list_cache_key(user_id, etag), data, settings.NOTE_LIST_CACHE_TIMEOUT
+        )
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+note_list_cache = NoteListCache()
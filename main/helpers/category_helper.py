@@ -0,0 +1,112 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from main.helpers.cache_helper import SHARED_CACHE_ALIAS
+from main.models import Category
+
+CATEGORY_VERSION_KEY = "category_registry:version"
+
+
+class CategoryRegistry:
+    """
+    Process local copy of the Category table
+
+    Categories are seeded once and rarely change, so every process keeps them all
+    in memory instead of querying or joining the table on each request.
+
+    The copy is tagged with a version kept in the shared cache. Saving or deleting a
+    category drops the local copy at once and bumps the shared version when the
+    transaction commits, other processes notice the new version within
+    CATEGORY_REGISTRY_CHECK_INTERVAL seconds and reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._categories = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def get(self, category_id):
+        """
+        Get a category by id
+
+        Args:
+            category_id (int): id of the category
+
+        Returns:
+            Category: Category object, None when the category doesn't exist
+        """
+        return self._current().get(category_id)
+
+    def in_bulk(self, category_ids):
+        """
+        Get many categories by id
+
+        Args:
+            category_ids (iterable): ids of the categories
+
+        Returns:
+            dict: id -> Category object for the ids that exist
+        """
+        categories = self._current()
+        return {
+            category_id: categories[category_id]
+            for category_id in category_ids
+            if category_id in categories
+        }
+
+    def all(self):
+        return sorted(self._current().values(), key=lambda category: category.id)
+
+    def invalidate(self):
+        """
+        Drop the local copy and, once the transaction commits, the other processes' copies
+        """
+        with self._lock:
+            self._categories = None
+
+        transaction.on_commit(bump_category_version)
+
+    def _current(self):
+        now = time.monotonic()
+
+        with self._lock:
+            categories = self._categories
+            if (
+                categories is not None
+                and now - self._checked_at < settings.CATEGORY_REGISTRY_CHECK_INTERVAL
+            ):
+                return categories
+
+            version = get_category_version()
+            if categories is None or version != self._version:
+                categories = self._load()
+                self._categories = categories
+                self._version = version
+            self._checked_at = now
+
+            return categories
+
+    def _load(self):
+        return {category.id: category for category in Category.objects.all()}
+
+
+def get_category_version():
+    # kept in the shared cache, every process has to see the bumps of the others
+    return caches[SHARED_CACHE_ALIAS].get_or_set(CATEGORY_VERSION_KEY, 1, timeout=None)
+
+
+def bump_category_version():
+    shared_cache = caches[SHARED_CACHE_ALIAS]
+    try:
+        shared_cache.incr(CATEGORY_VERSION_KEY)
+    except ValueError:
+        # the key expired or was evicted, any new value invalidates every copy
+        shared_cache.set(CATEGORY_VERSION_KEY, int(time.time()), timeout=None)
+
+
+category_registry = CategoryRegistry()
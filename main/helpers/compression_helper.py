@@ -0,0 +1,122 @@
+import gzip
+import io
+import zlib
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError, UnsupportedMediaType
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+
+try:
+    import zstandard
+except ImportError:  # zstd bodies are only accepted when zstandard is installed
+    zstandard = None
+
+READ_CHUNK_SIZE = 64 * 1024
+
+DECODE_ERRORS = (OSError, EOFError, zlib.error)
+if zstandard is not None:
+    DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+class RequestBodyTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Request body too large."
+    default_code = "request_body_too_large"
+
+
+def get_supported_encodings():
+    encodings = ["gzip", "x-gzip"]
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+def open_decoder(stream, encoding):
+    """
+    Wrap a compressed stream in a file object that reads it decompressed
+    """
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+
+    raise UnsupportedMediaType(
+        encoding,
+        detail=f"Unsupported Content-Encoding {encoding}, "
+        f"use one of {', '.join(get_supported_encodings())}",
+    )
+
+
+def decompress_stream(stream, encoding, max_size):
+    """
+    Decompress a request body chunk by chunk
+
+    Args:
+        stream: compressed request stream
+        encoding (str): Content-Encoding of the body
+        max_size (int): largest decompressed size accepted, in bytes
+
+    Returns:
+        BytesIO: the decompressed body
+
+    Raises:
+        RequestBodyTooLarge: the body inflates past max_size, decompression stops
+            there so a small compressed body can't exhaust memory
+        ParseError: the body is not valid for its encoding
+    """
+    decoder = open_decoder(stream, encoding)
+    body = io.BytesIO()
+
+    try:
+        while True:
+            chunk = decoder.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            body.write(chunk)
+            if body.tell() > max_size:
+                raise RequestBodyTooLarge(
+                    f"Decompressed request body is larger than {max_size} bytes."
+                )
+    except DECODE_ERRORS as exc:
+        raise ParseError(f"Invalid {encoding} request body: {exc}")
+
+    body.seek(0)
+    return body
+
+
+class DecompressingParserMixin:
+    """
+    Parser mixin that decodes a Content-Encoding compressed body before parsing it
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = (parser_context or {}).get("request")
+        encoding = ""
+        if request is not None:
+            encoding = request.META.get("HTTP_CONTENT_ENCODING", "").strip().lower()
+
+        if encoding and encoding != "identity":
+            stream = decompress_stream(
+                stream, encoding, settings.REQUEST_BODY_MAX_DECOMPRESSED_SIZE
+            )
+
+        return super().parse(stream, media_type, parser_context)
+
+
+class DecompressingJSONParser(DecompressingParserMixin, JSONParser):
+    pass
+
+
+class DecompressingFormParser(DecompressingParserMixin, FormParser):
+    pass
+
+
+# parsers for the views that take large bodies, compressed multipart is not supported
+COMPRESSED_BODY_PARSERS = [
+    DecompressingJSONParser,
+    DecompressingFormParser,
+    MultiPartParser,
+]
@@ -0,0 +1,48 @@
+import hashlib
+
+
+def content_hash(content):
+    """
+    Version hash of a note content, the base a content delta is checked against
+
+    Args:
+        content (str): note content
+
+    Returns:
+        str: hex sha256 of the UTF-8 encoded content
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def apply_content_delta(content, delta):
+    """
+    Apply splice operations to a note content
+
+    Args:
+        content (str): note content
+        delta (list): {"offset", "delete", "insert"} operations
+
+    Returns:
+        str: the new content
+
+    Raises:
+        ValueError: an operation reaches past the end of the content
+
+    Description:
+        - each operation removes ``delete`` characters at ``offset`` and inserts
+          ``insert`` there, offsets count characters (Unicode code points)
+        - operations apply in order, each one to the result of the previous one
+    """
+    for index, operation in enumerate(delta):
+        offset = operation["offset"]
+        end = offset + operation.get("delete", 0)
+
+        if end > len(content):
+            raise ValueError(
+                f"Operation {index} reaches past the end of the content "
+                f"({len(content)} characters)"
+            )
+
+        content = content[:offset] + operation.get("insert", "") + content[end:]
+
+    return content
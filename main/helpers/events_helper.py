@@ -0,0 +1,261 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import suppress
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+except ImportError:  # only the in-process broker is available without redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# sent instead of the events a slow subscriber could not keep up with, the client
+# then catches up through the delta sync endpoint
+OVERFLOW_EVENT = {"model": "stream", "action": "overflow"}
+
+
+class Subscription:
+    """
+    Events of one user for one listener, read with ``await subscription.get()``
+    """
+
+    def __init__(self, broker, user_id, max_size):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+    async def get(self):
+        return await self.queue.get()
+
+    def put(self, event):
+        """
+        Queue an event, runs on the subscriber's event loop
+        """
+        if self.overflowed:
+            return
+
+        if self.queue.full():
+            # drop what is queued, the client has to resync anyway
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW_EVENT)
+            self.overflowed = True
+            return
+
+        self.queue.put_nowait(event)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Publish / subscribe of change events between the threads of one process
+
+    Publishers are regular (sync) code such as signal receivers, subscribers are
+    coroutines streaming to a client, events are handed over to the subscriber's
+    event loop. Only listeners connected to the process that made the change are
+    notified, RedisBroker reaches the other processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, user_id):
+        """
+        Start listening to a user's events, must be called from a coroutine
+
+        Returns:
+            Subscription: close it when the listener goes away
+        """
+        subscription = Subscription(self, user_id, settings.NOTE_EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id, event):
+        """
+        Send an event to every listener of a user, safe to call from any thread
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # the listener's event loop is already closed
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self, user_id):
+        with self._lock:
+            return len(self._subscriptions.get(user_id, ()))
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Publish / subscribe of change events between processes through Redis pub/sub
+
+    Events are published on a channel per user. Each process listens to those
+    channels from a background thread, started with its first subscriber, and
+    hands the events over to its own subscribers like InProcessBroker does.
+    """
+
+    channel_prefix = "note-events:"
+
+    def __init__(self):
+        if redis is None:
+            raise ImproperlyConfigured("RedisBroker requires the redis package")
+
+        super().__init__()
+        self._client = redis.Redis.from_url(
+            settings.NOTE_EVENTS_REDIS_URL, decode_responses=True
+        )
+        self._listener = None
+
+    def subscribe(self, user_id):
+        subscription = super().subscribe(user_id)
+        with self._lock:
+            if self._listener is None:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(**{f"{self.channel_prefix}*": self._receive})
+                self._listener = pubsub.run_in_thread(
+                    sleep_time=1,
+                    daemon=True,
+                    exception_handler=self._listener_failed,
+                )
+        return subscription
+
+    def publish(self, user_id, event):
+        """
+        Send an event to every listener of a user, in any process
+        """
+        try:
+            self._client.publish(f"{self.channel_prefix}{user_id}", json.dumps(event))
+        except redis.RedisError:
+            # the change itself is committed, clients catch up through delta sync
+            logger.exception("Could not publish a note event")
+
+    def _receive(self, message):
+        user_id = int(message["channel"].removeprefix(self.channel_prefix))
+        super().publish(user_id, json.loads(message["data"]))
+
+    def _listener_failed(self, error, pubsub, thread):
+        # the connection is retried, and the channels subscribed again, on the next
+        # read
+        logger.warning("Note event listener lost its Redis connection: %s", error)
+        time.sleep(1)
+
+
+class DisconnectMiddleware:
+    """
+    ASGI middleware cancelling a request once its client disconnects
+
+    Django 4.2 stops reading from the server after the request body, so a
+    streaming response such as the note event stream keeps running, and keeps
+    its subscription, long after the client went away. Cancelling the request
+    closes the stream.
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.application(scope, receive, send)
+
+        body_read = asyncio.Event()
+
+        async def receive_body():
+            message = await receive()
+            if message["type"] != "http.request" or not message.get("more_body"):
+                body_read.set()
+            return message
+
+        async def wait_for_disconnect():
+            await body_read.wait()
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        request = asyncio.ensure_future(self.application(scope, receive_body, send))
+        disconnect = asyncio.ensure_future(wait_for_disconnect())
+        try:
+            await asyncio.wait(
+                {request, disconnect}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not request.done():
+                request.cancel()
+                with suppress(asyncio.CancelledError):
+                    await request
+                return
+            await request
+        finally:
+            disconnect.cancel()
+            request.cancel()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_event_broker():
+    """
+    The process wide broker, an instance of the NOTE_EVENTS_BROKER class
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.NOTE_EVENTS_BROKER)()
+        return _broker
+
+
+def publish_changes(model, action, changes):
+    """
+    Publish change events once the transaction commits
+
+    Args:
+        model (str): "note" or "reminder"
+        action (str): "save" or "delete"
+        changes (iterable): (owner id, object id) pairs, one event is sent per owner
+    """
+    ids_by_owner = defaultdict(list)
+    for owner_id, object_id in changes:
+        ids_by_owner[owner_id].append(object_id)
+
+    if not ids_by_owner:
+        return
+
+    def publish():
+        broker = get_event_broker()
+        for owner_id, ids in ids_by_owner.items():
+            broker.publish(owner_id, {"model": model, "action": action, "ids": ids})
+
+    transaction.on_commit(publish)
+
+
+def format_event(event):
+    """
+    Server-Sent Events frame of an event
+    """
+    data = json.dumps(event, separators=(",", ":"))
+    return f"event: {event['model']}\ndata: {data}\n\n"
@@ -0,0 +1,123 @@
+from dataclasses import dataclass, field
+
+from main.models import DiaryNote
+
+
+@dataclass
+class IndexPlan:
+    """
+    A DiaryNote index shaped (owner, *columns, id), optionally partial
+    """
+
+    name: str
+    columns: list
+    condition: dict = field(default_factory=dict)
+
+    def serve(self, equalities, range_field=None, sort_field=None):
+        """
+        Check whether this index can serve a query
+
+        Args:
+            equalities (dict): column -> value equality filters (owner excluded)
+            range_field (str): column with a range filter
+            sort_field (str): column the result is sorted on
+
+        Returns:
+            str: column the index returns rows ordered by, None if it can't serve the query
+
+        Description:
+            - the equality filters must be the leading columns of the index, the range
+              and the sort must both be on the column that follows them, which has to
+              be the last one before id for the rows to come in (column, id) order
+            - a partial index only serves queries that repeat its condition, since it
+              already narrows the rows down, other equality filters may be left to a
+              filter on top of the index scan
+            - a sort on a column pinned by an equality filter is a sort on id, served
+              once every equality filter is a leading column and id follows them
+        """
+        remaining = dict(equalities)
+        for column, value in self.condition.items():
+            if column not in remaining or remaining.pop(column) != value:
+                return None
+
+        consumed = 0
+        for column in self.columns:
+            if column not in remaining:
+                break
+            remaining.pop(column)
+            consumed += 1
+
+        if remaining and not self.condition:
+            return None
+
+        if consumed < len(self.columns) - 1:
+            return None
+
+        next_column = self.columns[consumed] if consumed < len(self.columns) else "id"
+        if range_field is not None and range_field != next_column:
+            return None
+        if sort_field is not None and sort_field != next_column:
+            if sort_field not in equalities or remaining or next_column != "id":
+                return None
+
+        return next_column
+
+
+def get_note_index_plans():
+    """
+    Build the index plans from DiaryNote.Meta.indexes
+
+    Returns:
+        list: IndexPlan objects, partial indexes first since they are smaller
+    """
+    plans = []
+    for index in DiaryNote._meta.indexes:
+        fields = list(index.fields)
+        if len(fields) < 2 or fields[0] != "owner" or fields[-1] != "id":
+            continue
+
+        condition = {}
+        if index.condition is not None:
+            condition = dict(index.condition.children)
+
+        # list queries only read live notes, which every list index is limited to,
+        # other indexes (trash, sync) don't serve lists
+        if condition.pop("deleted_at__isnull", None) is not True:
+            continue
+
+        plans.append(IndexPlan(index.name, fields[1:-1], condition))
+
+    return sorted(plans, key=lambda plan: not plan.condition)
+
+
+def plan_note_query(filters, sort_field=None):
+    """
+    Pick the index that serves a filtered diary note list
+
+    Args:
+        filters (dict): validated NoteFilterSerializer data
+        sort_field (str): model field the list is sorted on
+
+    Returns:
+        tuple: (IndexPlan, ordering) or (None, None) when no index can serve the query
+    """
+    equalities = {}
+    for name in ["category", "is_finished", "due"]:
+        if name in filters:
+            equalities[name] = filters[name]
+    if "priority" in filters:
+        equalities["priority_rank"] = DiaryNote.PRIORITY_RANKS[filters["priority"]]
+
+    range_field = None
+    if "due_before" in filters or "due_after" in filters:
+        range_field = "due_date"
+
+    for plan in get_note_index_plans():
+        column = plan.serve(equalities, range_field=range_field, sort_field=sort_field)
+        if column is None:
+            continue
+
+        ordering = ("id",) if column == "id" else (column, "id")
+        return plan, ordering
+
+    return None, None
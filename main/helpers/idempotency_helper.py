@@ -0,0 +1,92 @@
+import functools
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import status
+from rest_framework.response import Response
+
+from main.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """
+    Hash of the query string and body, a key may only be reused for the same request
+    """
+    payload = {
+        "method": request.method,
+        "path": request.path,
+        "query": request.GET.dict(),
+        "data": request.data,
+    }
+    encoded = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True).encode("utf-8")
+    return hashlib.md5(encoded).hexdigest()
+
+
+def idempotent(view_method):
+    """
+    Replay the first response of a request sent again with the same Idempotency-Key
+
+    Description:
+        - requests without the header are handled as usual
+        - successful responses are kept for IDEMPOTENCY_KEY_TIMEOUT seconds, failed
+          ones are not, so the client can fix the request and retry with the same key
+        - keys are kept in the database, a retry is replayed whichever worker it reaches
+        - a key reused with a different request, or while the first request is still
+          running, is rejected
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(view, request, *args, **kwargs)
+
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return Response(
+                {"message": f"{IDEMPOTENCY_HEADER} is too long"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_fingerprint(request)
+
+        # claim the key, a concurrent retry finds the claim and backs off
+        entry, claimed = IdempotencyKey.claim(request.user, key, fingerprint)
+        if claimed:
+            try:
+                response = view_method(view, request, *args, **kwargs)
+            except Exception:
+                entry.delete()
+                raise
+
+            if status.is_success(response.status_code):
+                entry.store_response(response.data, response.status_code)
+            else:
+                entry.delete()
+
+            return response
+
+        if entry is not None and entry.fingerprint != fingerprint:
+            return Response(
+                {
+                    "message": f"{IDEMPOTENCY_HEADER} was already used for another request"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if entry is None or entry.status_code is None:
+            return Response(
+                {"message": f"A request with this {IDEMPOTENCY_HEADER} is in progress"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(
+            entry.response,
+            status=entry.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    return wrapper
@@ -1,7 +1,361 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Estimate the number of rows of a queryset from the planner statistics
+
+    Args:
+        queryset (QuerySet): queryset to estimate
+
+    Returns:
+        int: estimated row count, None when the database can't estimate it
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class UncountedPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class UncountedPaginator(DjangoPaginator):
+    """
+    Paginator that fetches one row past the page instead of counting the rows
+
+    ``count`` is only known without a COUNT query when the page is the last one,
+    reading it on any other page still runs the count.
+    """
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+
+        has_more = len(rows) > self.per_page
+        if not has_more:
+            self.count = bottom + len(rows)
+
+        return UncountedPage(rows[: self.per_page], number, self, has_more)
+
+    @property
+    def count_is_known(self):
+        return "count" in vars(self)
 
 
 class CustomPagination(PageNumberPagination):
+    """
+    Page number pagination with an optional total count
+
+    The count query parameter selects how the total is computed:
+        - true (default): exact COUNT(*)
+        - false: no count, the response count is null
+        - estimate: planner estimate for large sets, exact below
+          ``exact_count_threshold`` rows or on the last page
+
+    ``count_is_approximate`` in the response flags an estimated count.
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    count_query_param = "count"
+    count_modes = ("true", "false", "estimate")
+    # estimates below this are cheap enough to replace with an exact count
+    exact_count_threshold = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = self.get_count_mode(request)
+        self.count_is_approximate = False
+
+        if self.count_mode == "true":
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        paginator = UncountedPaginator(queryset, self.get_page_size(request))
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        return list(self.page)
+
+    def get_count_mode(self, request):
+        count_mode = request.query_params.get(self.count_query_param, "").lower()
+        if count_mode not in self.count_modes:
+            return "true"
+        return count_mode
+
+    def get_count(self):
+        paginator = self.page.paginator
+
+        if self.count_mode == "true":
+            return paginator.count
+
+        if self.count_mode == "false":
+            return None
+
+        if paginator.count_is_known:
+            return paginator.count
+
+        estimate = estimate_count(paginator.object_list)
+        if estimate is None or estimate < self.exact_count_threshold:
+            return paginator.count
+
+        self.count_is_approximate = True
+        # there is at least one row past this page
+        seen = (self.page.number - 1) * paginator.per_page + len(self.page)
+        return max(estimate, seen + 1)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.get_count()),
+                    ("count_is_approximate", self.count_is_approximate),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a fixed ordering.
+
+    Pages are selected with a ``WHERE (sort key, id) > (last sort key, last id)``
+    filter instead of an OFFSET, so a deep page costs the same as the first one.
+    The ordering must end with a unique column (usually ``id``).
+
+    Cursors are opaque url-safe base64 strings; a missing or empty ``cursor``
+    query parameter returns the first page.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, ordering=("id",), view=None):
+        """
+        Return a single page of ``queryset`` ordered by ``ordering``
+
+        Args:
+            queryset (QuerySet): queryset to paginate
+            request (Request): current request
+            ordering (tuple): field names, optionally prefixed with "-"
+
+        Returns:
+            list: list of model instances
+        """
+        self.request = request
+        self.ordering = tuple(ordering)
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        position, reverse = self.decode_cursor(request)
+        if position is not None:
+            position = self._to_python(queryset, position)
+
+        if reverse:
+            queryset = queryset.order_by(*self._invert(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if position is not None:
+            queryset = queryset.filter(
+                self._after(self.ordering, position, reverse=reverse)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+
+        cursor = self.encode_cursor(self._position(self.page[-1]), reverse=False)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        cursor = self.encode_cursor(self._position(self.page[0]), reverse=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def encode_cursor(self, position, reverse):
+        payload = {"o": list(self.ordering), "p": position, "r": int(reverse)}
+        encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(encoded).decode("ascii")
+
+    def decode_cursor(self, request):
+        """
+        Decode the cursor query parameter
+
+        Returns:
+            tuple: (position, reverse), position is None for the first page
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            position = payload["p"]
+            reverse = bool(payload["r"])
+            ordering = tuple(payload["o"])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if ordering != self.ordering or not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def _to_python(self, queryset, position):
+        """
+        Convert the position values of a cursor to the sort columns' types, model
+        fields or annotations (e.g. a search rank)
+
+        Raises:
+            NotFound: a value doesn't fit its column, e.g. a tampered cursor
+        """
+        values = []
+        for field_name, value in zip(self.ordering, position):
+            name = field_name.lstrip("-")
+            if name in queryset.query.annotations:
+                field = queryset.query.annotations[name].output_field
+            else:
+                field = queryset.model._meta.get_field(name)
+            try:
+                value = field.to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+            # the sort columns are not nullable
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+
+        return values
+
+    def _position(self, instance):
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            if isinstance(value, (datetime.date, datetime.datetime)):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+        )
+
+    @staticmethod
+    def _after(ordering, position, reverse=False):
+        """
+        Build the row-comparison filter that selects rows strictly past ``position``
+
+        The OR'd branches alone only let the database bound the index on the columns
+        before the sort key, the leading range on the first sort column lets it seek
+        straight to the position.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            descending = field.startswith("-")
+            name = field.lstrip("-")
+            lookup = "lt" if descending != reverse else "gt"
+
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        first = ordering[0]
+        lookup = "lte" if first.startswith("-") != reverse else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": position[0]}) & condition
@@ -0,0 +1,15 @@
+PREVIEW_LENGTH = 200
+
+
+def make_preview(content, length=PREVIEW_LENGTH):
+    """
+    Short plain version of a note content for list screens
+
+    Args:
+        content (str): note content
+        length (int): maximum number of characters
+
+    Returns:
+        str: the first length characters, with runs of whitespace collapsed to a space
+    """
+    return " ".join(content.split())[:length]
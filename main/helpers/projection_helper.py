@@ -0,0 +1,85 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def get_projection_kwargs(request):
+    """
+    Read the fields / exclude query parameters
+
+    Args:
+        request (Request): current request
+
+    Returns:
+        dict: keyword arguments for a SparseFieldsMixin serializer
+    """
+    kwargs = {}
+    for param in ["fields", "exclude"]:
+        value = request.GET.get(param, "")
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        if names:
+            kwargs[param] = names
+
+    return kwargs
+
+
+def get_queryset_projection(serializer):
+    """
+    Model fields a (projected) model serializer reads
+
+    Args:
+        serializer (ModelSerializer): serializer instance
+
+    Returns:
+        tuple: (only, select_related) lookups for QuerySet.only() and select_related()
+    """
+    model = serializer.Meta.model
+    only = []
+    related = []
+
+    for field in serializer.fields.values():
+        try:
+            model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            # annotations such as the search rank are always selected
+            continue
+
+        only.append(field.source)
+
+        if isinstance(field, serializers.ModelSerializer) and getattr(
+            field, "needs_join", True
+        ):
+            related.append(field.source)
+            child_only, child_related = get_queryset_projection(field)
+            only.extend(f"{field.source}__{name}" for name in child_only)
+            related.extend(f"{field.source}__{name}" for name in child_related)
+
+    return only, related
+
+
+def project_queryset(queryset, serializer, extra_fields=()):
+    """
+    Narrow a queryset to the columns a (projected) serializer reads
+
+    Args:
+        queryset (QuerySet): queryset to narrow
+        serializer (ModelSerializer): serializer instance
+        extra_fields (list): more fields to load, e.g. the ordering fields
+
+    Returns:
+        QuerySet: narrowed queryset
+    """
+    only, related = get_queryset_projection(serializer)
+
+    for name in extra_fields:
+        name = name.lstrip("-")
+        try:
+            queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        only.append(name)
+
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+
+    return queryset.only(*only)
@@ -0,0 +1,189 @@
+import re
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = "english"
+SNIPPET_START = "<mark>"
+SNIPPET_STOP = "</mark>"
+
+NOTE_TABLE = "main_diarynote"
+NOTE_FTS_TABLE = "main_diarynote_fts"
+
+
+POSTGRES_SEARCH_SCHEMA = [
+    f"""
+    CREATE OR REPLACE FUNCTION {NOTE_TABLE}_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f"DROP TRIGGER IF EXISTS {NOTE_TABLE}_search_vector_trigger ON {NOTE_TABLE}",
+    f"""
+    CREATE TRIGGER {NOTE_TABLE}_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON {NOTE_TABLE}
+    FOR EACH ROW EXECUTE FUNCTION {NOTE_TABLE}_search_vector_update()
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS note_search_vector_idx
+    ON {NOTE_TABLE} USING gin (search_vector)
+    """,
+]
+
+POSTGRES_SEARCH_REBUILD = f"""
+    UPDATE {NOTE_TABLE} SET search_vector =
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')
+"""
+
+# external content FTS5 table kept in sync with the note table by triggers
+SQLITE_SEARCH_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {NOTE_FTS_TABLE} USING fts5(
+        title, content, content='{NOTE_TABLE}', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {NOTE_FTS_TABLE}_insert AFTER INSERT ON {NOTE_TABLE}
+    BEGIN
+        INSERT INTO {NOTE_FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {NOTE_FTS_TABLE}_delete AFTER DELETE ON {NOTE_TABLE}
+    BEGIN
+        INSERT INTO {NOTE_FTS_TABLE}({NOTE_FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {NOTE_FTS_TABLE}_update
+    AFTER UPDATE OF title, content ON {NOTE_TABLE}
+    BEGIN
+        INSERT INTO {NOTE_FTS_TABLE}({NOTE_FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {NOTE_FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_SEARCH_REBUILD = (
+    f"INSERT INTO {NOTE_FTS_TABLE}({NOTE_FTS_TABLE}) VALUES ('rebuild')"
+)
+
+
+def install_search_schema(connection, rebuild=False):
+    """
+    Create the full text search index and the triggers that maintain it
+
+    Args:
+        connection: database connection
+        rebuild (bool): re-index every existing note
+
+    Description:
+        - PostgreSQL: a trigger maintained tsvector column with a GIN index
+        - SQLite: an FTS5 table kept in sync with the note table by triggers
+        - every statement is idempotent, so this is safe to run after each migrate
+    """
+    if connection.vendor == "postgresql":
+        statements = list(POSTGRES_SEARCH_SCHEMA)
+        if rebuild:
+            statements.append(POSTGRES_SEARCH_REBUILD)
+    elif connection.vendor == "sqlite":
+        statements = list(SQLITE_SEARCH_SCHEMA)
+        if rebuild:
+            statements.append(SQLITE_SEARCH_REBUILD)
+    else:
+        return
+
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def build_fts_query(query):
+    """
+    Turn free text into an FTS5 MATCH expression
+
+    Every word is quoted so user input can never break the MATCH syntax,
+    the words are combined with an implicit AND.
+
+    Returns:
+        str: MATCH expression or None when the query has no words
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+
+    return " ".join(f'"{word}"' for word in words)
+
+
+def search_notes(queryset, query):
+    """
+    Filter diary notes by a full text query
+
+    Args:
+        queryset (QuerySet): DiaryNote queryset
+        query (str): free text query
+
+    Returns:
+        QuerySet: matching notes annotated with search_rank (higher is better)
+        and search_snippet (content excerpt with the matches highlighted)
+    """
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F("search_vector"), search_query),
+            search_snippet=SearchHeadline(
+                "content",
+                search_query,
+                config=SEARCH_CONFIG,
+                start_sel=SNIPPET_START,
+                stop_sel=SNIPPET_STOP,
+            ),
+        )
+
+    if vendor == "sqlite":
+        match = build_fts_query(query)
+        if match is None:
+            return queryset.none()
+
+        matching = f"FROM {NOTE_FTS_TABLE} WHERE {NOTE_FTS_TABLE} MATCH %s"
+        correlated = f"{matching} AND rowid = {NOTE_TABLE}.id"
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid {matching}", [match])
+        ).annotate(
+            # bm25 is lower-is-better, title matches weigh more than content matches
+            search_rank=RawSQL(
+                f"SELECT -bm25({NOTE_FTS_TABLE}, 10.0, 1.0) {correlated}",
+                [match],
+                output_field=FloatField(),
+            ),
+            search_snippet=RawSQL(
+                f"SELECT snippet({NOTE_FTS_TABLE}, 1, '{SNIPPET_START}', "
+                f"'{SNIPPET_STOP}', '...', 16) {correlated}",
+                [match],
+                output_field=TextField(),
+            ),
+        )
+
+    return queryset.filter(
+        Q(title__icontains=query) | Q(content__icontains=query)
+    ).annotate(
+        search_rank=Value(0.0, output_field=FloatField()),
+        search_snippet=Value(None, output_field=TextField()),
+    )
@@ -0,0 +1,68 @@
+import base64
+import json
+from collections import namedtuple
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# after: (updated_at, id) of the last note sent, None before the first one
+# deletion_id: id of the last NoteDeletion sent
+# issued_at: when the deletions after deletion_id started to be collected
+SyncToken = namedtuple("SyncToken", ["after", "deletion_id", "issued_at"])
+
+
+def encode_sync_token(token):
+    """
+    Encode a sync position as an opaque url-safe string
+
+    Args:
+        token (SyncToken): sync position
+
+    Returns:
+        str: url-safe base64 token
+    """
+    after = None
+    if token.after is not None:
+        updated_at, note_id = token.after
+        after = [updated_at.isoformat(), note_id]
+
+    payload = {"a": after, "d": token.deletion_id, "t": token.issued_at.isoformat()}
+    encoded = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(encoded).decode("ascii")
+
+
+def decode_sync_token(encoded):
+    """
+    Decode a token made by encode_sync_token
+
+    Args:
+        encoded (str): token sent by the client
+
+    Returns:
+        SyncToken: sync position
+
+    Raises:
+        ValueError: the token is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        after = payload["a"]
+        deletion_id = int(payload["d"])
+        issued_at = parse_datetime(payload["t"])
+        if after is not None:
+            updated_at, note_id = parse_datetime(after[0]), int(after[1])
+            after = (updated_at, note_id)
+    except (TypeError, ValueError, KeyError, IndexError, UnicodeEncodeError):
+        raise ValueError("Invalid sync token")
+
+    if issued_at is None or (after is not None and after[0] is None):
+        raise ValueError("Invalid sync token")
+
+    return SyncToken(after, deletion_id, issued_at)
+
+
+def initial_sync_token(last_deletion_id):
+    """
+    Position of a client that has nothing yet, deletions before it are irrelevant
+    """
+    return SyncToken(None, last_deletion_id, timezone.now())
@@ -0,0 +1,55 @@
+from django.db import connections, transaction
+from django.db.models import sql
+
+
+def update_returning(queryset, values, returning=("id",)):
+    """
+    Update the rows of a queryset and read columns back from the updated rows
+
+    Args:
+        queryset (QuerySet): rows to update
+        values (dict): field name -> new value, as for QuerySet.update()
+        returning (tuple): names of the fields to read back
+
+    Returns:
+        list: one tuple of the returning field values per updated row
+
+    Description:
+        - PostgreSQL and SQLite run a single UPDATE ... RETURNING statement
+        - other databases select the matching ids first, then update them in the
+          same transaction
+    """
+    connection = connections[queryset.db]
+    model = queryset.model
+
+    if not connection.features.can_return_columns_from_insert:
+        with transaction.atomic(using=queryset.db):
+            ids = list(queryset.select_for_update().values_list("pk", flat=True))
+            model.objects.filter(pk__in=ids).update(**values)
+            rows = model.objects.filter(pk__in=ids).values_list(*returning)
+            return [tuple(row) for row in rows]
+
+    query = queryset.query.chain(sql.UpdateQuery)
+    query.add_update_values(values)
+    query.annotations = {}
+    compiler = query.get_compiler(queryset.db)
+
+    update_sql, params = compiler.as_sql()
+    if not update_sql:
+        return []
+
+    fields = [model._meta.get_field(name) for name in returning]
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    # convert the returned columns the way a select would, e.g. dates on SQLite
+    expressions = [field.get_col(model._meta.db_table) for field in fields]
+    converters = compiler.get_converters(expressions)
+
+    with transaction.mark_for_rollback_on_error(using=queryset.db):
+        with connection.cursor() as cursor:
+            cursor.execute(f"{update_sql} RETURNING {columns}", params)
+            rows = cursor.fetchall()
+
+    if converters:
+        rows = compiler.apply_converters(rows, converters)
+
+    return [tuple(row) for row in rows]
@@ -133,6 +133,32 @@ def periodic_task_yearly():
         )
 
 
+def periodic_task_purge_note_trash():
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="0",
+        hour="3",
+        day_of_week="*",
+        day_of_month="*",
+        month_of_year="*",
+    )
+
+    # check if the task already exists
+    # if not, create it
+    start_datetime = timezone.now() + timezone.timedelta(seconds=10)
+
+    if not PeriodicTask.objects.filter(
+        name="purge note trash",
+        task="main.tasks.celery_purge_note_trash",
+        enabled=True,
+    ).exists():
+        PeriodicTask.objects.create(
+            crontab=schedule,
+            name="purge note trash",
+            task="main.tasks.celery_purge_note_trash",
+            start_time=start_datetime,
+        )
+
+
 class Command(BaseCommand):
     help = ""
 
@@ -146,3 +172,5 @@ class Command(BaseCommand):
         periodic_task_monthly()
 
         periodic_task_yearly()
+
+        periodic_task_purge_note_trash()
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_notereminder'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(fields=['owner', 'due_date', 'id'], name='note_owner_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(fields=['owner', 'priority', 'id'], name='note_owner_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='note_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(fields=['owner', 'is_finished', 'due_date', 'id'], name='note_finished_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(fields=['owner', 'is_finished', 'priority', 'id'], name='note_finished_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(fields=['owner', 'is_finished', 'created_at', 'id'], name='note_finished_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(condition=models.Q(('due', True)), fields=['owner', 'due_date', 'id'], name='note_overdue_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(condition=models.Q(('due', True)), fields=['owner', 'priority', 'id'], name='note_overdue_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diarynote',
+            index=models.Index(condition=models.Q(('due', True)), fields=['owner', 'created_at', 'id'], name='note_overdue_created_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:25
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from main.helpers.search_helper import install_search_schema
+
+
+def build_search_index(apps, schema_editor):
+    install_search_schema(schema_editor.connection, rebuild=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0004_diarynote_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="diarynote",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:27
+
+from django.db import migrations, models
+
+
+def backfill_priority_rank(apps, schema_editor):
+    DiaryNote = apps.get_model("main", "DiaryNote")
+    levels = ["Low", "Medium", "High"]
+
+    # one UPDATE per level, "Low" is already covered by the column default
+    for rank, level in enumerate(levels):
+        if rank:
+            DiaryNote.objects.filter(priority=level).update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0005_diarynote_search_vector"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_owner_priority_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_finished_priority_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_overdue_priority_idx",
+        ),
+        migrations.AddField(
+            model_name="diarynote",
+            name="priority_rank",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                fields=["owner", "priority_rank", "id"], name="note_owner_prio_rank_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                fields=["owner", "is_finished", "priority_rank", "id"],
+                name="note_finished_prio_rank_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("due", True)),
+                fields=["owner", "priority_rank", "id"],
+                name="note_overdue_prio_rank_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0006_diarynote_priority_rank"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                fields=["owner", "category", "due_date", "id"],
+                name="note_category_due_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,154 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0007_diarynote_category_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_owner_due_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_owner_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_finished_due_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_finished_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_overdue_due_date_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_overdue_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_owner_prio_rank_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_finished_prio_rank_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_overdue_prio_rank_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="diarynote",
+            name="note_category_due_date_idx",
+        ),
+        migrations.AddField(
+            model_name="diarynote",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "due_date", "id"],
+                name="note_owner_due_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "priority_rank", "id"],
+                name="note_owner_prio_rank_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "created_at", "id"],
+                name="note_owner_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "is_finished", "due_date", "id"],
+                name="note_finished_due_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "is_finished", "priority_rank", "id"],
+                name="note_finished_prio_rank_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "is_finished", "created_at", "id"],
+                name="note_finished_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "category", "due_date", "id"],
+                name="note_category_due_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("due", True)),
+                fields=["owner", "due_date", "id"],
+                name="note_overdue_due_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("due", True)),
+                fields=["owner", "priority_rank", "id"],
+                name="note_overdue_prio_rank_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True), ("due", True)),
+                fields=["owner", "created_at", "id"],
+                name="note_overdue_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["owner", "deleted_at", "id"],
+                name="note_trash_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="note_trash_purge_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:01
+
+from django.db import migrations
+
+from main.fields import set_postgres_column_compression
+
+
+def compress_content_column(apps, schema_editor):
+    set_postgres_column_compression(
+        schema_editor, apps.get_model("main", "DiaryNote"), "content"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0008_diarynote_trash"),
+    ]
+
+    operations = [
+        migrations.RunPython(compress_content_column, migrations.RunPython.noop),
+    ]
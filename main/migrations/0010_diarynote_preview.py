@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+from main.helpers.preview_helper import make_preview
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_preview(apps, schema_editor):
+    DiaryNote = apps.get_model("main", "DiaryNote")
+    last_id = 0
+
+    # the preview is built by the same Python helper the model saves it with
+    while True:
+        notes = list(
+            DiaryNote.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "content")[:BACKFILL_BATCH_SIZE]
+        )
+        if not notes:
+            break
+
+        for note in notes:
+            note.preview = make_preview(note.content)
+        DiaryNote.objects.bulk_update(notes, ["preview"])
+
+        last_id = notes[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0009_diarynote_compressed_content"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="diarynote",
+            name="preview",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=200
+            ),
+        ),
+        migrations.RunPython(backfill_preview, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("main", "0010_diarynote_preview"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NoteDeletion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("note_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "NOTE DELETION",
+                "verbose_name_plural": "NOTE DELETIONS",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                fields=["owner", "updated_at", "id"], name="note_owner_updated_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="notedeletion",
+            name="owner",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notedeletion",
+            index=models.Index(fields=["owner", "id"], name="note_deletion_owner_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notedeletion",
+            index=models.Index(fields=["deleted_at"], name="note_deletion_purge_idx"),
+        ),
+    ]
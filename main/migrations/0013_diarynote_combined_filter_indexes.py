@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-18 12:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("main", "0012_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "category", "priority_rank", "id"],
+                name="note_category_prio_rank_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "category", "created_at", "id"],
+                name="note_category_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "category", "is_finished", "due_date", "id"],
+                name="note_category_finished_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diarynote",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["owner", "priority_rank", "due_date", "id"],
+                name="note_prio_rank_due_date_idx",
+            ),
+        ),
+    ]
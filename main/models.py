@@ -1,7 +1,17 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 
 from account.managers import BaseModel
 from account.models import User
+from main.helpers.cache_helper import bump_note_list_version, invalidate_note
+from main.helpers.events_helper import publish_changes
+from main.helpers.preview_helper import PREVIEW_LENGTH, make_preview
+from main.helpers.update_helper import update_returning
 
 # Create your models here.
 
@@ -56,23 +66,161 @@ class DiaryNote(BaseModel):
         ("Medium", "Medium"),
         ("High", "High"),
     )
+    # sortable rank of each priority level, "Low" < "Medium" < "High"
+    PRIORITY_RANKS = {level: rank for rank, (level, _) in enumerate(PRIORITY_LEVELS)}
+    # columns list queries load, the owner is the requesting user and the category
+    # comes from the category registry, so neither is joined, lists show the preview
+    # and leave the content to the detail fetch
+    LIST_FIELDS = [
+        "owner",
+        "title",
+        "preview",
+        "category",
+        "priority",
+        "priority_rank",
+        "due_date",
+        "due",
+        "is_finished",
+        "created_at",
+        "updated_at",
+    ]
 
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="user_note")
     title = models.CharField(max_length=200)
     content = models.TextField()
+    # start of the content for list screens, kept in sync with content on write
+    preview = models.CharField(
+        max_length=PREVIEW_LENGTH, blank=True, default="", editable=False
+    )
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     priority = models.CharField(max_length=6, choices=PRIORITY_LEVELS, default="Low")
+    priority_rank = models.PositiveSmallIntegerField(default=0, editable=False)
     due_date = models.DateField()
     due = models.BooleanField(default=False)
     is_finished = models.BooleanField(default=False)
+    # set when the note is moved to the trash, trashed notes are purged later
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # maintained by a database trigger, see main.helpers.search_helper
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = "DIARY NOTE"
         verbose_name_plural = "DIARY NOTES"
+        # every list query filters on owner (plus status, category or priority
+        # columns) and sorts on one column, id is the tie breaker used by cursor
+        # pagination, list queries never read the trash so the list indexes leave it out
+        indexes = [
+            models.Index(
+                fields=["owner", "due_date", "id"],
+                name="note_owner_due_date_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "priority_rank", "id"],
+                name="note_owner_prio_rank_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "created_at", "id"],
+                name="note_owner_created_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # unfinished / done
+            models.Index(
+                fields=["owner", "is_finished", "due_date", "id"],
+                name="note_finished_due_date_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "is_finished", "priority_rank", "id"],
+                name="note_finished_prio_rank_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "is_finished", "created_at", "id"],
+                name="note_finished_created_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "category", "due_date", "id"],
+                name="note_category_due_date_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "category", "priority_rank", "id"],
+                name="note_category_prio_rank_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "category", "created_at", "id"],
+                name="note_category_created_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "category", "is_finished", "due_date", "id"],
+                name="note_category_finished_due_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # a priority within a due date range
+            models.Index(
+                fields=["owner", "priority_rank", "due_date", "id"],
+                name="note_prio_rank_due_date_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            # overdue, only the small due=True side is ever queried
+            models.Index(
+                fields=["owner", "due_date", "id"],
+                name="note_overdue_due_date_idx",
+                condition=models.Q(due=True, deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "priority_rank", "id"],
+                name="note_overdue_prio_rank_idx",
+                condition=models.Q(due=True, deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "created_at", "id"],
+                name="note_overdue_created_idx",
+                condition=models.Q(due=True, deleted_at__isnull=True),
+            ),
+            # trash listing and purge
+            models.Index(
+                fields=["owner", "deleted_at", "id"],
+                name="note_trash_idx",
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+            models.Index(
+                fields=["deleted_at"],
+                name="note_trash_purge_idx",
+                condition=models.Q(deleted_at__isnull=False),
+            ),
+            # delta sync, covers trashed notes too
+            models.Index(
+                fields=["owner", "updated_at", "id"],
+                name="note_owner_updated_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.priority_rank = self.PRIORITY_RANKS.get(self.priority, 0)
+        # a note loaded without its content keeps its preview
+        if "content" not in self.get_deferred_fields():
+            self.preview = make_preview(self.content)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if "priority" in update_fields:
+                update_fields.add("priority_rank")
+            if "content" in update_fields:
+                update_fields.add("preview")
+            kwargs["update_fields"] = update_fields
+
+        super().save(*args, **kwargs)
+
     @classmethod
     def get_all(cls, user):
         """
@@ -85,7 +233,9 @@ class DiaryNote(BaseModel):
             QuerySet: QuerySet of DiaryNote objects
 
         """
-        return cls.objects.filter(owner=user).select_related("owner", "category")
+        return cls.objects.filter(owner=user, deleted_at__isnull=True).only(
+            *cls.LIST_FIELDS
+        )
 
     @classmethod
     def get_note_by_id(cls, user, id):
@@ -101,12 +251,34 @@ class DiaryNote(BaseModel):
 
         """
         try:
-            instance = cls.objects.get(owner=user, id=id)
+            instance = cls.objects.defer("search_vector").get(
+                owner=user, id=id, deleted_at__isnull=True
+            )
         except cls.DoesNotExist:
             return None
 
         return instance
 
+    @classmethod
+    def get_content(cls, user, id, for_update=False):
+        """
+        Get the content of a diary note
+
+        Args:
+            user (User): User object
+            id (int): id of the diary note
+            for_update (bool): lock the row until the end of the transaction
+
+        Returns:
+            str: content of the diary note, None when the note doesn't exist
+
+        """
+        queryset = cls.objects.filter(owner=user, id=id, deleted_at__isnull=True)
+        if for_update:
+            queryset = queryset.select_for_update()
+
+        return queryset.values_list("content", flat=True).first()
+
     @classmethod
     def get_by_category(cls, user, category):
         """
@@ -120,9 +292,9 @@ class DiaryNote(BaseModel):
             QuerySet: QuerySet of DiaryNote objects
 
         """
-        return cls.objects.filter(owner=user, category=category).select_related(
-            "owner", "category"
-        )
+        return cls.objects.filter(
+            owner=user, category=category, deleted_at__isnull=True
+        ).only(*cls.LIST_FIELDS)
 
     @classmethod
     def get_by_priority(cls, user, priority):
@@ -137,9 +309,11 @@ class DiaryNote(BaseModel):
             QuerySet: QuerySet of DiaryNote objects
 
         """
-        return cls.objects.filter(owner=user, priority=priority).select_related(
-            "owner", "category"
-        )
+        return cls.objects.filter(
+            owner=user,
+            priority_rank=cls.PRIORITY_RANKS.get(priority),
+            deleted_at__isnull=True,
+        ).only(*cls.LIST_FIELDS)
 
     @classmethod
     def get_by_due_date(cls, user, date):
@@ -154,9 +328,9 @@ class DiaryNote(BaseModel):
             QuerySet: QuerySet of DiaryNote objects
 
         """
-        return cls.objects.filter(owner=user, due_date=date).select_related(
-            "owner", "category"
-        )
+        return cls.objects.filter(
+            owner=user, due_date=date, deleted_at__isnull=True
+        ).only(*cls.LIST_FIELDS)
 
     @classmethod
     def get_by_is_finished(cls, user, is_finished):
@@ -171,9 +345,9 @@ class DiaryNote(BaseModel):
             QuerySet: QuerySet of DiaryNote objects
 
         """
-        return cls.objects.filter(owner=user, is_finished=is_finished).select_related(
-            "owner", "category"
-        )
+        return cls.objects.filter(
+            owner=user, is_finished=is_finished, deleted_at__isnull=True
+        ).only(*cls.LIST_FIELDS)
 
     @classmethod
     def fetched_due_notes(cls, user):
@@ -187,8 +361,8 @@ class DiaryNote(BaseModel):
             QuerySet: QuerySet of DiaryNote objects
 
         """
-        return cls.objects.filter(owner=user, due=True).select_related(
-            "owner", "category"
+        return cls.objects.filter(owner=user, due=True, deleted_at__isnull=True).only(
+            *cls.LIST_FIELDS
         )
 
     @classmethod
@@ -203,9 +377,52 @@ class DiaryNote(BaseModel):
             QuerySet: QuerySet of DiaryNote objects
 
         """
-        return cls.objects.filter(owner=user, is_finished=False).select_related(
-            "owner", "category"
-        )
+        return cls.objects.filter(
+            owner=user, is_finished=False, deleted_at__isnull=True
+        ).only(*cls.LIST_FIELDS)
+
+    @classmethod
+    def filter_notes(
+        cls,
+        user,
+        category=None,
+        priority=None,
+        due_before=None,
+        due_after=None,
+        is_finished=None,
+        due=None,
+    ):
+        """
+        Get diary notes matching every given filter
+
+        Args:
+            user (User): User object
+            category (int): category id
+            priority (str): priority level
+            due_before (date): latest due date, inclusive
+            due_after (date): earliest due date, inclusive
+            is_finished (bool): is_finished
+            due (bool): due
+
+        Returns:
+            QuerySet: QuerySet of DiaryNote objects
+
+        """
+        filters = {"owner": user, "deleted_at__isnull": True}
+        if category is not None:
+            filters["category_id"] = category
+        if priority is not None:
+            filters["priority_rank"] = cls.PRIORITY_RANKS.get(priority)
+        if due_before is not None:
+            filters["due_date__lte"] = due_before
+        if due_after is not None:
+            filters["due_date__gte"] = due_after
+        if is_finished is not None:
+            filters["is_finished"] = is_finished
+        if due is not None:
+            filters["due"] = due
+
+        return cls.objects.filter(**filters).only(*cls.LIST_FIELDS)
 
     @classmethod
     def create_note(cls, **kwargs):
@@ -227,6 +444,289 @@ class DiaryNote(BaseModel):
         """
         return cls.objects.create(**kwargs)
 
+    @classmethod
+    def bulk_create_notes(cls, notes):
+        """
+        Create many diary notes with a single insert
+
+        Args:
+            notes (list): unsaved DiaryNote objects
+
+        Returns:
+            list: the created DiaryNote objects
+
+        Description:
+            - bulk_create skips save() and its signals, so the priority rank, preview,
+              note list version and change events are handled here
+            - the insert runs in one transaction, either every note is created or none
+        """
+        for note in notes:
+            note.priority_rank = cls.PRIORITY_RANKS.get(note.priority, 0)
+            note.preview = make_preview(note.content)
+
+        with transaction.atomic():
+            notes = cls.objects.bulk_create(notes)
+            bump_note_list_version(*(note.owner_id for note in notes))
+            publish_changes(
+                "note", "save", [(note.owner_id, note.id) for note in notes]
+            )
+
+        return notes
+
+    @classmethod
+    def update_notes(cls, queryset, **changes):
+        """
+        Update many diary notes with a single statement
+
+        Args:
+            queryset (QuerySet): owner scoped DiaryNote queryset
+            **changes: field name -> new value
+
+        Returns:
+            list: ids of the updated diary notes
+
+        Description:
+            - update() skips save(), so the priority rank, preview and updated_at are
+              set here
+            - the cached detail representation of every updated note is dropped, the
+              owners' note list version moves on and change events are published
+        """
+        if "priority" in changes:
+            changes["priority_rank"] = cls.PRIORITY_RANKS.get(changes["priority"], 0)
+        if "content" in changes:
+            changes["preview"] = make_preview(changes["content"])
+        changes["updated_at"] = timezone.now()
+
+        rows = update_returning(queryset, changes, returning=("id", "owner_id"))
+        note_ids = [note_id for note_id, _ in rows]
+        invalidate_note(*note_ids)
+        bump_note_list_version(*(owner_id for _, owner_id in rows))
+        publish_changes(
+            "note", "save", [(owner_id, note_id) for note_id, owner_id in rows]
+        )
+
+        return note_ids
+
+    @classmethod
+    def update_note(cls, user, id, **changes):
+        """
+        Update a diary note with a single UPDATE ... RETURNING statement
+
+        Args:
+            user (User): User object
+            id (int): id of the diary note
+            **changes: field name -> new value, category is set through category_id
+
+        Returns:
+            DiaryNote: the updated DiaryNote object, None when nothing was updated
+
+        Description:
+            - only the given fields are written
+            - a new category is checked inside the statement, the update matches no row
+              when the category doesn't exist
+            - the owner and the category are not loaded on the returned note
+        """
+        queryset = cls.objects.filter(owner=user, id=id, deleted_at__isnull=True)
+        if "category_id" in changes:
+            queryset = queryset.filter(
+                models.Exists(Category.objects.filter(id=changes["category_id"]))
+            )
+
+        if "priority" in changes:
+            changes["priority_rank"] = cls.PRIORITY_RANKS.get(changes["priority"], 0)
+        if "content" in changes:
+            changes["preview"] = make_preview(changes["content"])
+        changes["updated_at"] = timezone.now()
+
+        field_names = [
+            field.attname
+            for field in cls._meta.concrete_fields
+            if field.name != "search_vector"
+        ]
+        rows = update_returning(queryset, changes, returning=field_names)
+        if not rows:
+            return None
+
+        instance = cls.from_db(queryset.db, field_names, rows[0])
+        invalidate_note(instance.id)
+        bump_note_list_version(instance.owner_id)
+        publish_changes("note", "save", [(instance.owner_id, instance.id)])
+
+        return instance
+
+    @classmethod
+    def get_changes(cls, user, after=None):
+        """
+        Get the diary notes of a user written after a sync position
+
+        Args:
+            user (User): User object
+            after (tuple): (updated_at, id) of the last note the client has, None
+                for every note
+
+        Returns:
+            QuerySet: QuerySet of DiaryNote objects ordered by updated_at, id
+
+        Description:
+            - trashed notes are included, their deleted_at tells the client
+        """
+        queryset = cls.objects.filter(owner=user).defer("search_vector")
+        if after is not None:
+            updated_at, note_id = after
+            queryset = queryset.filter(
+                models.Q(updated_at__gt=updated_at)
+                | models.Q(updated_at=updated_at, id__gt=note_id)
+            )
+
+        return queryset.order_by("updated_at", "id")
+
+    @classmethod
+    def get_status_counts(cls, user):
+        """
+        Count the diary notes of a user by status and priority
+
+        Args:
+            user (User): User object
+
+        Returns:
+            dict: total, unfinished, done, overdue and one count per priority level
+
+        Description:
+            - one aggregate query, trashed notes are not counted
+        """
+        counts = {
+            "total": models.Count("id"),
+            "unfinished": models.Count("id", filter=models.Q(is_finished=False)),
+            "done": models.Count("id", filter=models.Q(is_finished=True)),
+            "overdue": models.Count("id", filter=models.Q(due=True)),
+        }
+        for level, _ in cls.PRIORITY_LEVELS:
+            counts[level] = models.Count("id", filter=models.Q(priority=level))
+
+        return cls.objects.filter(owner=user, deleted_at__isnull=True).aggregate(
+            **counts
+        )
+
+    @classmethod
+    def get_category_counts(cls, user):
+        """
+        Count the diary notes of a user by category
+
+        Args:
+            user (User): User object
+
+        Returns:
+            dict: category id -> number of notes, categories without notes are left out
+        """
+        rows = (
+            cls.objects.filter(owner=user, deleted_at__isnull=True)
+            .values("category_id")
+            .annotate(count=models.Count("id"))
+            .order_by()
+        )
+        return {row["category_id"]: row["count"] for row in rows}
+
+    @classmethod
+    def get_upcoming(cls, user, limit):
+        """
+        Get the next unfinished diary notes of a user by due date
+
+        Args:
+            user (User): User object
+            limit (int): number of notes
+
+        Returns:
+            QuerySet: QuerySet of DiaryNote objects due today or later
+        """
+        return (
+            cls.objects.filter(
+                owner=user,
+                is_finished=False,
+                due_date__gte=timezone.localdate(),
+                deleted_at__isnull=True,
+            )
+            .only(*cls.LIST_FIELDS)
+            .order_by("due_date", "id")[:limit]
+        )
+
+    @classmethod
+    def get_trash(cls, user):
+        """
+        Get the diary notes a user moved to the trash
+
+        Args:
+            user (User): User object
+
+        Returns:
+            QuerySet: QuerySet of DiaryNote objects
+
+        """
+        return cls.objects.filter(owner=user, deleted_at__isnull=False).only(
+            *cls.LIST_FIELDS, "deleted_at"
+        )
+
+    @classmethod
+    def trash_notes(cls, user, ids):
+        """
+        Move diary notes to the trash
+
+        Args:
+            user (User): User object
+            ids (list): ids of the diary notes
+
+        Returns:
+            list: ids of the diary notes moved to the trash
+
+        """
+        queryset = cls.objects.filter(owner=user, id__in=ids, deleted_at__isnull=True)
+        return cls.update_notes(queryset, deleted_at=timezone.now())
+
+    @classmethod
+    def restore_notes(cls, user, ids):
+        """
+        Restore diary notes from the trash
+
+        Args:
+            user (User): User object
+            ids (list): ids of the diary notes
+
+        Returns:
+            list: ids of the restored diary notes
+
+        """
+        queryset = cls.objects.filter(owner=user, id__in=ids, deleted_at__isnull=False)
+        return cls.update_notes(queryset, deleted_at=None)
+
+    @classmethod
+    def purge_trash(cls, deleted_before, chunk_size=500):
+        """
+        Delete diary notes that have been in the trash since before a date
+
+        Args:
+            deleted_before (datetime): notes trashed before this are deleted
+            chunk_size (int): number of notes deleted per statement
+
+        Returns:
+            int: number of diary notes deleted
+
+        Description:
+            - the notes and their reminders are deleted chunk by chunk, each chunk in its
+              own transaction, so no single statement or lock grows with the trash size
+        """
+        deleted = 0
+        while True:
+            note_ids = list(
+                cls.objects.filter(deleted_at__lt=deleted_before)
+                .order_by("deleted_at")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not note_ids:
+                return deleted
+
+            with transaction.atomic():
+                _, counts = cls.objects.filter(id__in=note_ids).delete()
+            deleted += counts.get(cls._meta.label, 0)
+
 
 class NoteReminder(BaseModel):
     REMINDER_INTERVALS = (
@@ -245,6 +745,178 @@ class NoteReminder(BaseModel):
     def __str__(self):
         return self.note.title
 
+    @classmethod
+    def get_upcoming(cls, user, limit):
+        """
+        Get the next reminders of a user by start date
+
+        Args:
+            user (User): User object
+            limit (int): number of reminders
+
+        Returns:
+            QuerySet: QuerySet of NoteReminder objects starting today or later, with
+                the id and title of their note
+
+        Description:
+            - reminders of trashed notes are left out
+        """
+        return (
+            cls.objects.filter(
+                note__owner=user,
+                note__deleted_at__isnull=True,
+                start_date__gte=timezone.localdate(),
+            )
+            .select_related("note")
+            .only(
+                "start_date",
+                "reminder_interval",
+                "reminder_message",
+                "note__id",
+                "note__title",
+            )
+            .order_by("start_date", "id")[:limit]
+        )
+
     class Meta:
         verbose_name = "NOTE REMINDER"
         verbose_name_plural = "NOTE REMINDERS"
+
+
+class NoteDeletion(models.Model):
+    """
+    Log of deleted diary notes, the delta sync endpoint returns it as tombstones
+    """
+
+    # no database constraint, entries outlive the note and are purged on their own
+    owner = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    note_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "NOTE DELETION"
+        verbose_name_plural = "NOTE DELETIONS"
+        indexes = [
+            models.Index(fields=["owner", "id"], name="note_deletion_owner_idx"),
+            models.Index(fields=["deleted_at"], name="note_deletion_purge_idx"),
+        ]
+
+    @classmethod
+    def get_tombstones(cls, user, after_id):
+        """
+        Get the deletions of a user's diary notes logged after a log entry
+
+        Args:
+            user (User): User object
+            after_id (int): id of the last log entry the client has
+
+        Returns:
+            QuerySet: QuerySet of NoteDeletion objects ordered by id
+        """
+        return cls.objects.filter(owner=user, id__gt=after_id).order_by("id")
+
+    @classmethod
+    def get_last_id(cls, user, before=None):
+        """
+        Get the id of the last deletion logged for a user, 0 when there is none
+
+        Args:
+            user (User): User object
+            before (datetime): only count deletions made up to then, None for all
+        """
+        queryset = cls.objects.filter(owner=user)
+        if before is not None:
+            queryset = queryset.filter(deleted_at__lte=before)
+
+        last_id = queryset.aggregate(last_id=models.Max("id"))
+        return last_id["last_id"] or 0
+
+    @classmethod
+    def purge(cls, deleted_before):
+        """
+        Delete the log entries older than a date
+
+        Returns:
+            int: number of entries deleted
+        """
+        deleted, _ = cls.objects.filter(deleted_at__lt=deleted_before).delete()
+        return deleted
+
+
+class IdempotencyKey(models.Model):
+    """
+    First response to a request sent with an Idempotency-Key
+
+    Kept in the database so every worker sees it, a retry often reaches another
+    worker than the first attempt. See main.helpers.idempotency_helper.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    key = models.CharField(max_length=255)
+    # hash of the request the key was first used for
+    fingerprint = models.CharField(max_length=32)
+    # both null while the first request is running
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "IDEMPOTENCY KEY"
+        verbose_name_plural = "IDEMPOTENCY KEYS"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="idempotency_key_user_key_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="idempotency_key_purge_idx"),
+        ]
+
+    @classmethod
+    def claim(cls, user, key, fingerprint):
+        """
+        Claim a key for a request, unless another request holds it
+
+        Args:
+            user (User): User object
+            key (str): Idempotency-Key sent by the client
+            fingerprint (str): hash of the request
+
+        Returns:
+            tuple: (IdempotencyKey object, True when the key was claimed), the
+                object is None when the holder went away in the meantime
+
+        Description:
+            - the unique (user, key) constraint lets only one request claim a key,
+              whichever worker it runs on
+            - keys older than IDEMPOTENCY_KEY_TIMEOUT seconds can be claimed again
+        """
+        expired_before = timezone.now() - timedelta(
+            seconds=settings.IDEMPOTENCY_KEY_TIMEOUT
+        )
+        cls.objects.filter(user=user, key=key, created_at__lt=expired_before).delete()
+
+        try:
+            with transaction.atomic():
+                entry = cls.objects.create(user=user, key=key, fingerprint=fingerprint)
+            return entry, True
+        except IntegrityError:
+            return cls.objects.filter(user=user, key=key).first(), False
+
+    def store_response(self, data, status_code):
+        self.response = data
+        self.status_code = status_code
+        self.save(update_fields=["response", "status_code"])
+
+    @classmethod
+    def purge(cls, created_before):
+        """
+        Delete the keys used before a date
+
+        Returns:
+            int: number of keys deleted
+        """
+        deleted, _ = cls.objects.filter(created_at__lt=created_before).delete()
+        return deleted
@@ -1,34 +1,153 @@
+from collections import defaultdict
+
+from django.conf import settings
 from rest_framework import serializers
 
 from account.serilaizers import UserSerializer
-from main.models import Category, DiaryNote, NoteReminder
+from main.helpers.category_helper import category_registry
+from main.models import Category, DiaryNote, NoteDeletion, NoteReminder
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets
+
+    Pass fields and/or exclude (lists of output field names) to keep or drop
+    fields, a dotted name such as "note.title" projects a nested serializer.
+    """
+
+    # output name -> serializer field name, for fields renamed in to_representation
+    field_aliases = {}
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields or exclude:
+            self.project(fields or [], exclude or [])
+
+    def project(self, fields, exclude):
+        keep = set()
+        drop = set()
+        nested_fields = defaultdict(list)
+        nested_exclude = defaultdict(list)
+
+        for name in fields:
+            head, rest = self._split_field_name(name)
+            keep.add(head)
+            if rest:
+                nested_fields[head].append(rest)
+
+        for name in exclude:
+            head, rest = self._split_field_name(name)
+            if rest:
+                nested_exclude[head].append(rest)
+            else:
+                drop.add(head)
+
+        for name in list(self.fields):
+            if (keep and name not in keep) or name in drop:
+                self.fields.pop(name)
+
+        for name in set(nested_fields) | set(nested_exclude):
+            nested_serializer = self.fields.get(name)
+            if nested_serializer is None:
+                continue
 
+            if not isinstance(nested_serializer, SparseFieldsMixin):
+                raise serializers.ValidationError(
+                    {"fields": f"{name} can not be projected"}
+                )
 
-class CategorySerializer(serializers.ModelSerializer):
+            nested_serializer.project(nested_fields[name], nested_exclude[name])
+
+    def _split_field_name(self, name):
+        head, _, rest = name.partition(".")
+        head = self.field_aliases.get(head, head)
+
+        if head not in self.fields:
+            raise serializers.ValidationError({"fields": f"Unknown field {name}"})
+
+        return head, rest
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = "__all__"
 
 
-class DiaryNoteSerializer(serializers.ModelSerializer):
+class RegistryCategorySerializer(CategorySerializer):
+    """
+    Category of a diary note, read from the category registry instead of a join
+    """
+
+    # tells the queryset projection not to join the category table
+    needs_join = False
+
+    def get_attribute(self, instance):
+        return category_registry.get(instance.category_id)
+
+
+class DiaryNoteSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     owner = UserSerializer()
-    category = CategorySerializer()
+    category = RegistryCategorySerializer()
+
+    field_aliases = {"user": "owner"}
 
     class Meta:
         model = DiaryNote
-        fields = "__all__"
+        exclude = ["search_vector", "priority_rank", "deleted_at", "preview"]
         depth = 1
 
     def to_representation(self, instance):
         data = super(DiaryNoteSerializer, self).to_representation(instance)
-        user_data = data.pop("owner")
-        category_data = data.pop("category")
 
-        data["user"] = user_data
-        data["category"] = category_data
+        if "owner" in data:
+            data["user"] = data.pop("owner")
+        if "category" in data:
+            data["category"] = data.pop("category")
         return data
 
 
+class DiaryNoteListSerializer(DiaryNoteSerializer):
+    """
+    Diary note list item, the owner is returned once in the response envelope and
+    the preview stands in for the content, which only the detail fetch returns
+    """
+
+    owner = None
+
+    class Meta(DiaryNoteSerializer.Meta):
+        exclude = ["search_vector", "priority_rank", "deleted_at", "owner", "content"]
+
+
+class DiaryNoteTrashSerializer(DiaryNoteListSerializer):
+    class Meta(DiaryNoteListSerializer.Meta):
+        exclude = ["search_vector", "priority_rank", "owner", "content"]
+
+
+class DiaryNoteSyncSerializer(DiaryNoteListSerializer):
+    """
+    Diary note as sent to syncing clients, with its content and trash state
+    """
+
+    class Meta(DiaryNoteListSerializer.Meta):
+        exclude = ["search_vector", "priority_rank", "owner", "preview"]
+
+
+class NoteTombstoneSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="note_id")
+
+    class Meta:
+        model = NoteDeletion
+        fields = ["id", "deleted_at"]
+
+
+class DiaryNoteSearchResultSerializer(DiaryNoteListSerializer):
+    rank = serializers.FloatField(source="search_rank", read_only=True)
+    snippet = serializers.CharField(source="search_snippet", read_only=True)
+
+
 class CreateDiaryNoteSerializer(serializers.Serializer):
     PRIORITY_LEVELS = (
         ("Low", "Low"),
@@ -42,6 +161,166 @@ class CreateDiaryNoteSerializer(serializers.Serializer):
     due_date = serializers.DateField()
 
 
+class ContentSpliceSerializer(serializers.Serializer):
+    offset = serializers.IntegerField(min_value=0)
+    delete = serializers.IntegerField(min_value=0, default=0)
+    insert = serializers.CharField(allow_blank=True, trim_whitespace=False, default="")
+
+
+class PatchDiaryNoteSerializer(CreateDiaryNoteSerializer):
+    MAX_DELTA_OPERATIONS = 1000
+
+    content_delta = ContentSpliceSerializer(
+        many=True, allow_empty=False, max_length=MAX_DELTA_OPERATIONS, required=False
+    )
+    base_hash = serializers.CharField(max_length=64, required=False)
+
+    def validate(self, attrs):
+        if "content_delta" in attrs:
+            if "content" in attrs:
+                raise serializers.ValidationError(
+                    "Send either content or content_delta"
+                )
+            if "base_hash" not in attrs:
+                raise serializers.ValidationError(
+                    "base_hash is required with content_delta"
+                )
+
+        return attrs
+
+
+class BulkCreateDiaryNoteSerializer(serializers.Serializer):
+    MAX_NOTES = 100
+
+    notes = CreateDiaryNoteSerializer(
+        many=True, allow_empty=False, max_length=MAX_NOTES
+    )
+
+    def validate_notes(self, value):
+        # the ids are replaced by the category objects
+        categories = category_registry.in_bulk({note["category"] for note in value})
+
+        errors = []
+        for note in value:
+            if note["category"] in categories:
+                note["category"] = categories[note["category"]]
+                errors.append({})
+            else:
+                errors.append({"category": ["Category does not exist"]})
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return value
+
+
+class NoteFilterSerializer(serializers.Serializer):
+    STATUS_FILTERS = {
+        "unfinished": {"is_finished": False},
+        "overdue": {"due": True},
+        "done": {"is_finished": True},
+    }
+
+    filter_by = serializers.ChoiceField(choices=list(STATUS_FILTERS), required=False)
+    category = serializers.IntegerField(required=False)
+    priority = serializers.ChoiceField(
+        choices=DiaryNote.PRIORITY_LEVELS, required=False
+    )
+    due_before = serializers.DateField(required=False)
+    due_after = serializers.DateField(required=False)
+    is_finished = serializers.BooleanField(required=False)
+    due = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        filter_by = attrs.pop("filter_by", None)
+
+        # filter_by is a shorthand for the status filters
+        for field, value in self.STATUS_FILTERS.get(filter_by, {}).items():
+            if attrs.setdefault(field, value) != value:
+                raise serializers.ValidationError(
+                    f"filter_by={filter_by} conflicts with {field}"
+                )
+
+        due_before = attrs.get("due_before")
+        due_after = attrs.get("due_after")
+        if due_before and due_after and due_after > due_before:
+            raise serializers.ValidationError(
+                "due_after must be on or before due_before"
+            )
+
+        return attrs
+
+
+class NoteBatchGetSerializer(serializers.Serializer):
+    MAX_IDS = 100
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
+
+    def validate_ids(self, value):
+        # drop duplicates, keep the requested order
+        return list(dict.fromkeys(value))
+
+
+class NoteBulkUpdateSerializer(serializers.Serializer):
+    MAX_IDS = 1000
+    CHANGE_FIELDS = ["is_finished", "priority", "category"]
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+        required=False,
+    )
+    filter = NoteFilterSerializer(required=False)
+    is_finished = serializers.BooleanField(required=False)
+    priority = serializers.ChoiceField(
+        choices=DiaryNote.PRIORITY_LEVELS, required=False
+    )
+    category = serializers.IntegerField(required=False)
+    return_rows = serializers.BooleanField(default=False)
+
+    def validate_category(self, value):
+        if category_registry.get(value) is None:
+            raise serializers.ValidationError("Category does not exist")
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Provide either ids or filter")
+
+        if not any(field in attrs for field in self.CHANGE_FIELDS):
+            raise serializers.ValidationError(
+                f"Provide at least one of {', '.join(self.CHANGE_FIELDS)}"
+            )
+
+        return attrs
+
+    def get_changes(self):
+        changes = {}
+        for field in self.CHANGE_FIELDS:
+            if field in self.validated_data:
+                changes[field] = self.validated_data[field]
+
+        if "category" in changes:
+            changes["category_id"] = changes.pop("category")
+
+        return changes
+
+
+class NoteTrashSerializer(serializers.Serializer):
+    MAX_IDS = 1000
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
+
+
 class DownloadNoteSerializer(serializers.Serializer):
     file_type_options = (("csv", "csv"), ("pdf", "pdf"))
     note_ids = serializers.ListField()
@@ -75,7 +354,7 @@ class UpdateReminderSerializer(serializers.Serializer):
     reminder_message = serializers.CharField(max_length=255)
 
 
-class NoteReminderSerializer(serializers.ModelSerializer):
+class NoteReminderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     note = DiaryNoteSerializer()
 
     class Meta:
@@ -85,7 +364,34 @@ class NoteReminderSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super(NoteReminderSerializer, self).to_representation(instance)
-        note_data = data.pop("note")
 
-        data["note"] = note_data
+        if "note" in data:
+            data["note"] = data.pop("note")
         return data
+
+
+class UpcomingReminderSerializer(serializers.ModelSerializer):
+    """
+    Reminder on the dashboard, with the id and title of its note instead of the note
+    """
+
+    note_id = serializers.IntegerField(source="note.id")
+    note_title = serializers.CharField(source="note.title")
+
+    class Meta:
+        model = NoteReminder
+        fields = [
+            "id",
+            "note_id",
+            "note_title",
+            "start_date",
+            "reminder_interval",
+            "reminder_message",
+        ]
+
+
+class DashboardQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_limit(self, value):
+        return min(value, settings.DASHBOARD_UPCOMING_MAX_LIMIT)
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from main.helpers.cache_helper import bump_note_list_version, invalidate_note
+from main.helpers.category_helper import category_registry
+from main.helpers.events_helper import publish_changes
+from main.models import Category, DiaryNote, NoteDeletion, NoteReminder
+
+
+@receiver(post_save, sender=DiaryNote)
+@receiver(post_delete, sender=DiaryNote)
+def invalidate_note_cache(sender, instance, **kwargs):
+    invalidate_note(instance.id)
+    bump_note_list_version(instance.owner_id)
+
+
+@receiver(post_delete, sender=DiaryNote)
+def log_note_deletion(sender, instance, **kwargs):
+    NoteDeletion.objects.create(owner_id=instance.owner_id, note_id=instance.id)
+
+
+@receiver(post_save, sender=DiaryNote)
+def publish_note_save(sender, instance, **kwargs):
+    publish_changes("note", "save", [(instance.owner_id, instance.id)])
+
+
+@receiver(post_delete, sender=DiaryNote)
+def publish_note_delete(sender, instance, **kwargs):
+    publish_changes("note", "delete", [(instance.owner_id, instance.id)])
+
+
+def get_reminder_owner_id(reminder):
+    if NoteReminder.note.is_cached(reminder):
+        return reminder.note.owner_id
+
+    # the note may be gone already when its deletion cascades to the reminder
+    return (
+        DiaryNote.objects.filter(id=reminder.note_id)
+        .values_list("owner_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=NoteReminder)
+@receiver(post_delete, sender=NoteReminder)
+def reminder_changed(sender, instance, signal, **kwargs):
+    owner_id = get_reminder_owner_id(instance)
+    if owner_id is None:
+        return
+
+    bump_note_list_version(owner_id)
+
+    action = "delete" if signal is post_delete else "save"
+    publish_changes("reminder", action, [(owner_id, instance.id)])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_registry(sender, instance, **kwargs):
+    category_registry.invalidate()
@@ -1,15 +1,16 @@
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pandas as pd
 import pytz
 from celery import shared_task
 from django.conf import settings
 from django.template.loader import render_to_string
+from django.utils import timezone
 from xhtml2pdf import pisa
 
 from main.helpers.emails_helper import EmailHandler
-from main.models import DiaryNote, NoteReminder
+from main.models import DiaryNote, IdempotencyKey, NoteDeletion, NoteReminder
 
 
 @shared_task
@@ -73,7 +74,7 @@ def celery_save_diary_note_as_pdf(
         This function saves the diary note queryset as a pdf file
     """
     notes = DiaryNote.objects.filter(
-        id__in=item_ids, owner__email=email
+        id__in=item_ids, owner__email=email, deleted_at__isnull=True
     ).select_related("owner", "category")
 
     html_content = render_to_string(
@@ -109,7 +110,9 @@ def celery_save_diary_note_as_csv(item_ids: list, file_name: str, email: str):
         This function saves the diary note as a csv file and sends it to the user's email
     """
     notes = list(
-        DiaryNote.objects.filter(id__in=item_ids, owner__email=email)
+        DiaryNote.objects.filter(
+            id__in=item_ids, owner__email=email, deleted_at__isnull=True
+        )
         .select_related("owner", "category")
         .values(
             "owner__first_name",
@@ -142,7 +145,9 @@ def celery_thirty_minutes_reminder():
     TODAYS_DATE = TODAY.date()
 
     qs = NoteReminder.objects.filter(
-        reminder_interval="Thirty_Minutes", start_date__gte=TODAYS_DATE
+        reminder_interval="Thirty_Minutes",
+        start_date__gte=TODAYS_DATE,
+        note__deleted_at__isnull=True,
     ).select_related("note", "note__owner", "note__category")
 
     if qs.exists():
@@ -169,7 +174,9 @@ def celery_daily_reminder():
     TODAYS_DATE = TODAY.date()
 
     qs = NoteReminder.objects.filter(
-        reminder_interval="Daily", start_date__gte=TODAYS_DATE
+        reminder_interval="Daily",
+        start_date__gte=TODAYS_DATE,
+        note__deleted_at__isnull=True,
     ).select_related("note", "note__owner", "note__category")
 
     if qs.exists():
@@ -195,7 +202,9 @@ def celery_weekly_reminder():
     TODAYS_DATE = TODAY.date()
 
     qs = NoteReminder.objects.filter(
-        reminder_interval="Weekly", start_date__gte=TODAYS_DATE
+        reminder_interval="Weekly",
+        start_date__gte=TODAYS_DATE,
+        note__deleted_at__isnull=True,
     ).select_related("note", "note__owner", "note__category")
 
     if qs.exists():
@@ -221,7 +230,9 @@ def celery_monthly_reminder():
     TODAYS_DATE = TODAY.date()
 
     qs = NoteReminder.objects.filter(
-        reminder_interval="Monthly", start_date__gte=TODAYS_DATE
+        reminder_interval="Monthly",
+        start_date__gte=TODAYS_DATE,
+        note__deleted_at__isnull=True,
     ).select_related("note", "note__owner", "note__category")
 
     if qs.exists():
@@ -247,7 +258,9 @@ def celery_yearly_reminder():
     TODAYS_DATE = TODAY.date()
 
     qs = NoteReminder.objects.filter(
-        reminder_interval="Yearly", start_date__gte=TODAYS_DATE
+        reminder_interval="Yearly",
+        start_date__gte=TODAYS_DATE,
+        note__deleted_at__isnull=True,
     ).select_related("note", "note__owner", "note__category")
 
     if qs.exists():
@@ -258,3 +271,35 @@ def celery_yearly_reminder():
                 note_title=item.note.title,
                 year=TODAYS_DATE.year,
             )
+
+
+@shared_task
+def celery_purge_note_trash():
+    """
+    THIS IS A CELERY TASK
+
+    Description:
+        This function deletes the diary notes that have been in the trash for longer
+        than NOTE_TRASH_RETENTION_DAYS, in chunks of NOTE_TRASH_PURGE_CHUNK_SIZE notes,
+        forgets the deletions logged more than NOTE_DELETION_LOG_RETENTION_DAYS ago and
+        the Idempotency-Keys used more than IDEMPOTENCY_KEY_TIMEOUT seconds ago
+    """
+
+    deleted_before = timezone.now() - timedelta(days=settings.NOTE_TRASH_RETENTION_DAYS)
+
+    deleted = DiaryNote.purge_trash(
+        deleted_before=deleted_before,
+        chunk_size=settings.NOTE_TRASH_PURGE_CHUNK_SIZE,
+    )
+
+    forgotten = NoteDeletion.purge(
+        deleted_before=timezone.now()
+        - timedelta(days=settings.NOTE_DELETION_LOG_RETENTION_DAYS)
+    )
+
+    expired_keys = IdempotencyKey.purge(
+        created_before=timezone.now()
+        - timedelta(seconds=settings.IDEMPOTENCY_KEY_TIMEOUT)
+    )
+
+    return {"deleted": deleted, "forgotten": forgotten, "expired_keys": expired_keys}
@@ -1,15 +1,45 @@
 from django.urls import path
 
 from main.views import (
+    DashboardApiView,
     DiaryNoteApiView,
+    DiaryNoteBatchGetApiView,
+    DiaryNoteBulkCreateApiView,
+    DiaryNoteBulkUpdateApiView,
+    DiaryNoteChangesApiView,
+    DiaryNoteDetailApiView,
+    DiaryNoteRestoreApiView,
+    DiaryNoteTrashApiView,
     DownloadNoteToFile,
     NoteCategoryApiView,
     NoteReminderApiView,
+    note_events,
 )
 
 urlpatterns = [
     path("categories/", NoteCategoryApiView.as_view(), name="category-list"),
     path("note/", DiaryNoteApiView.as_view(), name="note-list"),
+    path("notes/batch_get/", DiaryNoteBatchGetApiView.as_view(), name="note-batch-get"),
+    path(
+        "notes/bulk_create/",
+        DiaryNoteBulkCreateApiView.as_view(),
+        name="note-bulk-create",
+    ),
+    path(
+        "notes/bulk_update/",
+        DiaryNoteBulkUpdateApiView.as_view(),
+        name="note-bulk-update",
+    ),
+    path("notes/changes/", DiaryNoteChangesApiView.as_view(), name="note-changes"),
+    path("notes/events/", note_events, name="note-events"),
+    path("notes/trash/", DiaryNoteTrashApiView.as_view(), name="note-trash"),
+    path(
+        "notes/trash/restore/",
+        DiaryNoteRestoreApiView.as_view(),
+        name="note-trash-restore",
+    ),
+    path("notes/<int:note_id>/", DiaryNoteDetailApiView.as_view(), name="note-detail"),
     path("download_note/", DownloadNoteToFile.as_view(), name="download-note"),
     path("reminder/", NoteReminderApiView.as_view(), name="reminder-list"),
+    path("dashboard/", DashboardApiView.as_view(), name="dashboard"),
 ]
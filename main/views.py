@@ -1,4 +1,12 @@
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from drf_yasg import openapi
@@ -10,15 +18,51 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
-from main.helpers.pagination_helper import CustomPagination
-from main.models import Category, DiaryNote, NoteReminder
+from account.serilaizers import UserSerializer
+from main.helpers.cache_helper import (
+    cache_note,
+    compute_list_etag,
+    etag_matches,
+    get_cached_note,
+    get_note_list_version,
+    note_list_cache,
+)
+from main.helpers.category_helper import category_registry, get_category_version
+from main.helpers.compression_helper import COMPRESSED_BODY_PARSERS
+from main.helpers.delta_helper import apply_content_delta, content_hash
+from main.helpers.events_helper import format_event, get_event_broker
+from main.helpers.filter_helper import plan_note_query
+from main.helpers.idempotency_helper import idempotent
+from main.helpers.pagination_helper import CustomPagination, KeysetPagination
+from main.helpers.projection_helper import get_projection_kwargs, project_queryset
+from main.helpers.search_helper import search_notes
+from main.helpers.sync_helper import (
+    SyncToken,
+    decode_sync_token,
+    encode_sync_token,
+    initial_sync_token,
+)
+from main.models import Category, DiaryNote, NoteDeletion, NoteReminder
 from main.serializers import (
+    BulkCreateDiaryNoteSerializer,
     CategorySerializer,
     CreateDiaryNoteSerializer,
     CreateReminderSerializer,
+    DashboardQuerySerializer,
+    DiaryNoteListSerializer,
+    DiaryNoteSearchResultSerializer,
     DiaryNoteSerializer,
+    DiaryNoteSyncSerializer,
+    DiaryNoteTrashSerializer,
     DownloadNoteSerializer,
+    NoteBatchGetSerializer,
+    NoteBulkUpdateSerializer,
+    NoteFilterSerializer,
     NoteReminderSerializer,
+    NoteTombstoneSerializer,
+    NoteTrashSerializer,
+    PatchDiaryNoteSerializer,
+    UpcomingReminderSerializer,
     UpdateReminderSerializer,
 )
 from main.tasks import celery_send_diary_note_as_a_file
@@ -66,12 +110,23 @@ class NoteCategoryApiView(APIView):
     def get(self, request):
         """
         GET REQUEST
+
+        DESCRIPTION:
+            - count=false skips the total count, count=estimate may return an estimate
+            - The response carries a weak ETag, sending it back in the If-None-Match header
+              returns 304 Not Modified without querying the categories while they are unchanged
         """
+        etag = compute_list_etag(request, get_category_version())
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
         category_qs = Category.objects.all()
         paginator = CustomPagination()
         result_page = paginator.paginate_queryset(category_qs, request)
         serializer = self.serializer_class(result_page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        response = paginator.get_paginated_response(serializer.data)
+        response["ETag"] = etag
+        return response
 
 
 class DiaryNoteApiView(APIView):
@@ -81,6 +136,7 @@ class DiaryNoteApiView(APIView):
 
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    parser_classes = COMPRESSED_BODY_PARSERS
 
     # CREATE NOTE SWAGGER SCHEMA
     create_note_schema = openapi.Schema(
@@ -171,6 +227,18 @@ class DiaryNoteApiView(APIView):
             "priority": openapi.Schema(type=openapi.TYPE_STRING),
             "due_date": openapi.Schema(type=openapi.TYPE_STRING),
             "is_finished": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+            "content_delta": openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "offset": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "delete": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "insert": openapi.Schema(type=openapi.TYPE_STRING),
+                    },
+                ),
+            ),
+            "base_hash": openapi.Schema(type=openapi.TYPE_STRING),
         },
     )
 
@@ -222,16 +290,14 @@ class DiaryNoteApiView(APIView):
         operation_description="Create Diary Note",
         request_body=create_note_schema,
     )
+    @idempotent
     def post(self, request):
         serializer = CreateDiaryNoteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         # get category object
-        try:
-            category = Category.objects.get(
-                id=serializer.validated_data.get("category")
-            )
-        except Category.DoesNotExist:
+        category = category_registry.get(serializer.validated_data.get("category"))
+        if category is None:
             return Response(
                 {"message": "Category does not exist"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -270,57 +336,133 @@ class DiaryNoteApiView(APIView):
             - This method also allow users to filter their diary notes by providing the filter_by query parameter
             - The filter_by query parameter can be one of the following: unfinished, overdue, done
             - If the filter_by query parameter is not provided, all diary notes will be returned
+            - The category, priority, due_before, due_after, is_finished and due query parameters
+              filter the diary notes further, they can be combined with each other and with filter_by
+            - Combinations that no index can serve are rejected, with DEBUG on the index used is
+              reported in the X-Note-Index-Plan response header
             - This method also allow users to sort their diary notes by providing the sort_by query parameter
             - The sort_by query parameter can be one of the following: due_date, priority, created_time
+            - The sort_order query parameter (asc or desc, default asc) sets the sort direction
+            - Passing the cursor query parameter (empty for the first page) switches to keyset
+              pagination, the response then carries opaque next/previous cursors instead of a count
+            - With page number pagination, count=false skips the total count and count=estimate
+              returns a planner estimate for large lists, flagged by count_is_approximate
+            - The q query parameter runs a full text search over title and content, results are
+              ranked by relevance unless sort_by is provided and carry a highlighted snippet
+            - Items carry a short whitespace-normalized preview instead of the content, the
+              full content is returned by the note detail endpoint
+            - The response carries a weak ETag, sending it back in the If-None-Match header
+              returns 304 Not Modified before any note is queried while the user's notes,
+              the categories and the user are unchanged
+            - Serialized pages are cached per user and query string under the same markers,
+              any write to the user's notes or reminders makes them stale
         """
+        etag = compute_list_etag(
+            request,
+            get_note_list_version(request.user.id),
+            get_category_version(),
+            request.user.updated_at,
+        )
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        cached_data = note_list_cache.get(request.user.id, etag)
+        if cached_data is not None:
+            return Response(
+                cached_data, status=status.HTTP_200_OK, headers={"ETag": etag}
+            )
+
         filter_options = ["unfinished", "overdue", "done"]
         sort_options = ["due_date", "priority", "created_date"]
+        sort_order_options = ["asc", "desc"]
+
+        # ordering for each sort option, id breaks ties between equal sort keys
+        sort_orderings = {
+            "due_date": ("due_date", "id"),
+            "priority": ("priority_rank", "id"),
+            "created_date": ("created_at", "id"),
+        }
 
         sort_by = request.GET.get("sort_by", None)
+        sort_order = request.GET.get("sort_order", "asc")
+        search_query = request.GET.get("q", "").strip()
 
         filter_by = request.GET.get("filter_by", None)
-        if filter_by is not None:
-            if filter_by not in filter_options:
+        if filter_by is not None and filter_by not in filter_options:
+            return Response(
+                {"message": "Invalid filter option"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if sort_by is not None and sort_by not in sort_options:
+            return Response(
+                {"message": "Invalid sort option"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if sort_order not in sort_order_options:
+            return Response(
+                {"message": "Invalid sort order"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filter_serializer = NoteFilterSerializer(data=request.GET.dict())
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+
+        user_notes = DiaryNote.filter_notes(user=request.user, **filters)
+
+        serializer_class = DiaryNoteListSerializer
+        if search_query:
+            # the search index narrows the notes down, filters apply to the matches
+            user_notes = search_notes(user_notes, search_query)
+            serializer_class = DiaryNoteSearchResultSerializer
+            index_name = "search"
+            ordering = ("-search_rank", "id")
+
+        else:
+            sort_field = sort_orderings[sort_by][0] if sort_by is not None else None
+            index_plan, ordering = plan_note_query(filters, sort_field=sort_field)
+            if index_plan is None:
                 return Response(
-                    {"message": "Invalid filter option"},
+                    {"message": "This filter and sort combination is not supported"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            index_name = index_plan.name
 
-            if filter_by == "unfinished":
-                user_notes = DiaryNote.get_unfinished(user=request.user)
+        # sort queryset section
+        if sort_by is not None:
+            ordering = sort_orderings[sort_by]
+            if sort_order == "desc":
+                ordering = tuple(f"-{field}" for field in ordering)
 
-            elif filter_by == "overdue":
-                user_notes = DiaryNote.fetched_due_notes(user=request.user)
-            elif filter_by == "done":
-                user_notes = DiaryNote.get_by_is_finished(
-                    user=request.user, is_finished=True
-                )
+        user_notes = user_notes.order_by(*ordering)
 
-            else:
-                user_notes = DiaryNote.get_all(user=request.user)
+        projection = get_projection_kwargs(request)
+        if projection:
+            user_notes = project_queryset(
+                user_notes, serializer_class(**projection), extra_fields=ordering
+            )
 
+        if "cursor" in request.GET:
+            paginator = KeysetPagination()
+            result_page = paginator.paginate_queryset(
+                user_notes, request, ordering=ordering
+            )
         else:
-            user_notes = DiaryNote.get_all(user=request.user)
+            paginator = CustomPagination()
+            result_page = paginator.paginate_queryset(user_notes, request)
 
-        # sort queryset section
-        if sort_by is not None:
-            if sort_by not in sort_options:
-                return Response(
-                    {"message": "Invalid sort option"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+        serializer = serializer_class(result_page, many=True, **projection)
+        response = paginator.get_paginated_response(serializer.data)
+        response.data["user"] = UserSerializer(request.user).data
 
-            if sort_by == "due_date":
-                user_notes = user_notes.order_by("due_date")
-            elif sort_by == "priority":
-                user_notes = user_notes.order_by("priority")
-            elif sort_by == "created_date":
-                user_notes = user_notes.order_by("created_at")
+        if settings.DEBUG:
+            response["X-Note-Index-Plan"] = index_name
 
-        paginator = CustomPagination()
-        result_page = paginator.paginate_queryset(user_notes, request)
-        serializer = DiaryNoteSerializer(result_page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        note_list_cache.set(request.user.id, etag, response.data)
+        response["ETag"] = etag
+        return response
 
     @method_decorator(csrf_exempt)
     @swagger_auto_schema(
@@ -333,6 +475,8 @@ class DiaryNoteApiView(APIView):
         """
         THIS METHOD ALLOW USERS TO UPDATE A DIARY NOTE
 
+        DESCRIPTION:
+            - The note is updated with a single statement, which also checks the category
         """
 
         note_id = request.GET.get("note_id", None)
@@ -346,35 +490,7 @@ class DiaryNoteApiView(APIView):
         serializer = CreateDiaryNoteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        title = serializer.validated_data.get("title")
-        content = serializer.validated_data.get("content")
-        priority_level = serializer.validated_data.get("priority_level")
-        category = serializer.validated_data.get("category")
-
-        try:
-            category = Category.objects.get(id=category)
-        except Category.DoesNotExist:
-            return Response(
-                {"message": "Category does not exist"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        user_note_instance = DiaryNote.get_note_by_id(user=request.user, id=note_id)
-        if user_note_instance is None:
-            return Response(
-                {"message": "Diary Note record not found"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        user_note_instance.title = title
-        user_note_instance.content = content
-        user_note_instance.priority = priority_level
-        user_note_instance.category = category
-        user_note_instance.save()
-
-        data = DiaryNoteSerializer(user_note_instance).data
-
-        return Response(data, status=status.HTTP_201_CREATED)
+        return self.update_note(request, note_id, serializer.validated_data)
 
     @method_decorator(csrf_exempt)
     @swagger_auto_schema(
@@ -387,6 +503,13 @@ class DiaryNoteApiView(APIView):
         """
         THIS METHOD ALLOW USERS TO PARTIALLY UPDATE A DIARY NOTE
 
+        DESCRIPTION:
+            - Only the fields sent are written, with a single statement
+            - Instead of the whole content, content_delta can send a list of
+              {"offset", "delete", "insert"} splices together with base_hash, the sha256 hex
+              digest of the UTF-8 content the splices were made against
+            - When the content changed since base_hash, nothing is written and 409 is returned
+              with the current content_hash
         """
 
         note_id = request.GET.get("note_id", None)
@@ -397,35 +520,80 @@ class DiaryNoteApiView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_note_instance = DiaryNote.get_note_by_id(user=request.user, id=note_id)
-        if user_note_instance is None:
-            return Response(
-                {"message": "Diary Note record not found"},
-                status=status.HTTP_400_BAD_REQUEST,
+        serializer = PatchDiaryNoteSerializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        validated_data = dict(serializer.validated_data)
+        if "content_delta" not in validated_data:
+            return self.update_note(request, note_id, validated_data)
+
+        with transaction.atomic():
+            content = DiaryNote.get_content(
+                user=request.user, id=note_id, for_update=True
             )
+            if content is None:
+                return Response(
+                    {"message": "Diary Note record not found"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        title = request.data.get("title", user_note_instance.title)
-        content = request.data.get("content", user_note_instance.content)
-        priority_level = request.data.get("priority_level", user_note_instance.priority)
-        category = request.data.get("category", None)
+            current_hash = content_hash(content)
+            if current_hash != validated_data.pop("base_hash"):
+                return Response(
+                    {
+                        "message": "The note content changed since base_hash",
+                        "content_hash": current_hash,
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            try:
+                validated_data["content"] = apply_content_delta(
+                    content, validated_data.pop("content_delta")
+                )
+            except ValueError as exc:
+                return Response(
+                    {"message": str(exc)},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            return self.update_note(request, note_id, validated_data)
+
+    def update_note(self, request, note_id, validated_data):
+        """
+        Write the validated title, content, priority_level and category of a note
+        """
+        changes = {}
+        for field, model_field in [
+            ("title", "title"),
+            ("content", "content"),
+            ("priority_level", "priority"),
+            ("category", "category_id"),
+        ]:
+            if field in validated_data:
+                changes[model_field] = validated_data[field]
+
+        user_note_instance = DiaryNote.update_note(
+            user=request.user, id=note_id, **changes
+        )
+
+        if user_note_instance is None:
+            # the update matched no row, find out why
+            if (
+                "category_id" in changes
+                and category_registry.get(changes["category_id"]) is None
+            ):
+                return Response(
+                    {"message": "Category does not exist"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        try:
-            if category is None:
-                category = user_note_instance.category
-            else:
-                category = Category.objects.get(id=category)
-        except Category.DoesNotExist:
             return Response(
-                {"message": "Category does not exist"},
+                {"message": "Diary Note record not found"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_note_instance.title = title
-        user_note_instance.content = content
-        user_note_instance.priority = priority_level
-        user_note_instance.category = category
-        user_note_instance.save()
-
+        user_note_instance.owner = request.user
         data = DiaryNoteSerializer(user_note_instance).data
 
         return Response(data, status=status.HTTP_201_CREATED)
@@ -440,6 +608,8 @@ class DiaryNoteApiView(APIView):
         """
         THIS METHOD ALLOW USERS TO DELETE A DIARY NOTE
 
+        DESCRIPTION:
+            - The note is moved to the trash, it can be restored until the trash is purged
         """
 
         note_id = request.GET.get("note_id", None)
@@ -450,21 +620,782 @@ class DiaryNoteApiView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_note_instance = DiaryNote.get_note_by_id(user=request.user, id=note_id)
-        if user_note_instance is None:
+        if not DiaryNote.trash_notes(user=request.user, ids=[note_id]):
             return Response(
                 {"message": "Diary Note record not found"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_note_instance.delete()
-
         return Response(
             {"message": "Diary note deleted successfully"},
             status=status.HTTP_204_NO_CONTENT,
         )
 
 
+class DiaryNoteDetailApiView(APIView):
+    """
+    DIARY NOTE DETAIL API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    fetch_note_response_schema = {
+        status.HTTP_200_OK: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "title": openapi.Schema(type=openapi.TYPE_STRING),
+                "content": openapi.Schema(type=openapi.TYPE_STRING),
+                "category": openapi.Schema(type=openapi.TYPE_OBJECT),
+                "priority": openapi.Schema(type=openapi.TYPE_STRING),
+                "due_date": openapi.Schema(type=openapi.TYPE_STRING),
+                "is_finished": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                "created_at": openapi.Schema(type=openapi.TYPE_STRING),
+                "updated_at": openapi.Schema(type=openapi.TYPE_STRING),
+            },
+        ),
+        status.HTTP_304_NOT_MODIFIED: "Not Modified",
+        status.HTTP_400_BAD_REQUEST: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "message": openapi.Schema(type=openapi.TYPE_STRING),
+            },
+        ),
+    }
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Get a single Diary Note",
+        responses=fetch_note_response_schema,
+    )
+    def get(self, request, note_id):
+        """
+        THIS METHOD ALLOW USERS TO GET A SINGLE DIARY NOTE
+
+        DESCRIPTION:
+            - The serialized note is cached until the note is saved or deleted, or the
+              categories or the user it embeds change
+            - The response carries an ETag, sending it back in the If-None-Match header
+              returns 304 Not Modified when the note did not change
+        """
+        versions = [get_category_version(), request.user.updated_at]
+        entry = get_cached_note(note_id, versions)
+
+        if entry is None or entry["owner_id"] != request.user.id:
+            user_note_instance = DiaryNote.get_note_by_id(user=request.user, id=note_id)
+            if user_note_instance is None:
+                return Response(
+                    {"message": "Diary Note record not found"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # list helpers don't join the owner, it is the requesting user
+            user_note_instance.owner = request.user
+            data = DiaryNoteSerializer(user_note_instance).data
+            entry = cache_note(user_note_instance, data, versions)
+
+        if etag_matches(request, entry["etag"]):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry["etag"]}
+            )
+
+        return Response(
+            entry["data"], status=status.HTTP_200_OK, headers={"ETag": entry["etag"]}
+        )
+
+
+class DiaryNoteBatchGetApiView(APIView):
+    """
+    DIARY NOTE BATCH GET API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = COMPRESSED_BODY_PARSERS
+
+    batch_get_schema = openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "ids": openapi.Schema(
+                type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)
+            ),
+        },
+        required=["ids"],
+    )
+
+    batch_get_response_schema = {
+        status.HTTP_200_OK: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "results": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+                "missing": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                ),
+            },
+        ),
+        status.HTTP_400_BAD_REQUEST: "Bad Request",
+    }
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Get many Diary Notes by id",
+        request_body=batch_get_schema,
+        responses=batch_get_response_schema,
+    )
+    def post(self, request):
+        """
+        THIS METHOD ALLOW USERS TO GET MANY DIARY NOTES IN ONE REQUEST
+
+        DESCRIPTION:
+            - The notes are fetched with a single query, in the order the ids were sent
+            - Ids that don't exist or belong to another user are listed under missing
+        """
+        serializer = NoteBatchGetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        note_ids = serializer.validated_data.get("ids")
+
+        notes = DiaryNote.get_all(user=request.user).filter(id__in=note_ids)
+
+        projection = get_projection_kwargs(request)
+        if projection:
+            notes = project_queryset(notes, DiaryNoteListSerializer(**projection))
+        notes_by_id = {note.id: note for note in notes}
+
+        found = [notes_by_id[note_id] for note_id in note_ids if note_id in notes_by_id]
+        missing = [note_id for note_id in note_ids if note_id not in notes_by_id]
+
+        return Response(
+            {
+                "user": UserSerializer(request.user).data,
+                "results": DiaryNoteListSerializer(found, many=True, **projection).data,
+                "missing": missing,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class DiaryNoteBulkCreateApiView(APIView):
+    """
+    DIARY NOTE BULK CREATE API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = COMPRESSED_BODY_PARSERS
+
+    bulk_create_schema = openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "notes": openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=DiaryNoteApiView.create_note_schema,
+            ),
+        },
+        required=["notes"],
+    )
+
+    bulk_create_response_schema = {
+        status.HTTP_201_CREATED: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "results": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+            },
+        ),
+        status.HTTP_400_BAD_REQUEST: "Bad Request",
+    }
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Create many Diary Notes",
+        request_body=bulk_create_schema,
+        responses=bulk_create_response_schema,
+    )
+    @idempotent
+    def post(self, request):
+        """
+        THIS METHOD ALLOW USERS TO CREATE MANY DIARY NOTES IN ONE REQUEST
+
+        DESCRIPTION:
+            - Up to 100 notes are validated together, the categories are fetched with one query
+            - Errors are reported per note, in the order the notes were sent, and no note is
+              created unless every note is valid
+            - The notes are inserted with a single statement, in one transaction
+            - Retries sent with the same Idempotency-Key header replay the first response
+        """
+        serializer = BulkCreateDiaryNoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        notes = [
+            DiaryNote(
+                owner=request.user,
+                title=note.get("title"),
+                content=note.get("content"),
+                category=note.get("category"),
+                priority=note.get("priority_level"),
+                due_date=note.get("due_date"),
+            )
+            for note in serializer.validated_data.get("notes")
+        ]
+
+        notes = DiaryNote.bulk_create_notes(notes)
+
+        return Response(
+            {
+                "user": UserSerializer(request.user).data,
+                "results": DiaryNoteListSerializer(notes, many=True).data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class DiaryNoteBulkUpdateApiView(APIView):
+    """
+    DIARY NOTE BULK UPDATE API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = COMPRESSED_BODY_PARSERS
+
+    bulk_update_schema = openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "ids": openapi.Schema(
+                type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)
+            ),
+            "filter": openapi.Schema(type=openapi.TYPE_OBJECT),
+            "is_finished": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+            "priority": openapi.Schema(type=openapi.TYPE_STRING),
+            "category": openapi.Schema(type=openapi.TYPE_INTEGER),
+            "return_rows": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+        },
+    )
+
+    bulk_update_response_schema = {
+        status.HTTP_200_OK: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "updated": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "results": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+            },
+        ),
+        status.HTTP_400_BAD_REQUEST: "Bad Request",
+    }
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Update many Diary Notes",
+        request_body=bulk_update_schema,
+        responses=bulk_update_response_schema,
+    )
+    def post(self, request):
+        """
+        THIS METHOD ALLOW USERS TO UPDATE MANY DIARY NOTES IN ONE REQUEST
+
+        DESCRIPTION:
+            - The notes are selected by ids (up to 1000) or by a filter, the filter takes the
+              same keys as the note list query parameters, an empty filter selects every note
+            - is_finished, priority and category set the new values, at least one is required
+            - The update runs as a single statement scoped to the user's notes
+            - return_rows adds the updated notes to the response
+        """
+        serializer = NoteBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        if "ids" in serializer.validated_data:
+            notes = DiaryNote.objects.filter(
+                owner=request.user,
+                id__in=serializer.validated_data.get("ids"),
+                deleted_at__isnull=True,
+            )
+        else:
+            notes = DiaryNote.filter_notes(
+                user=request.user, **serializer.validated_data.get("filter")
+            )
+
+        note_ids = DiaryNote.update_notes(notes, **serializer.get_changes())
+
+        data = {"updated": len(note_ids)}
+
+        if serializer.validated_data.get("return_rows"):
+            updated_notes = DiaryNote.get_all(user=request.user).filter(id__in=note_ids)
+            data["user"] = UserSerializer(request.user).data
+            data["results"] = DiaryNoteListSerializer(
+                updated_notes.order_by("id"), many=True
+            ).data
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class DiaryNoteTrashApiView(APIView):
+    """
+    DIARY NOTE TRASH API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = COMPRESSED_BODY_PARSERS
+
+    trash_schema = openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "ids": openapi.Schema(
+                type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)
+            ),
+        },
+        required=["ids"],
+    )
+
+    trash_response_schema = {
+        status.HTTP_200_OK: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "updated": openapi.Schema(type=openapi.TYPE_INTEGER),
+            },
+        ),
+        status.HTTP_400_BAD_REQUEST: "Bad Request",
+    }
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Get the trashed Diary Notes",
+    )
+    def get(self, request):
+        """
+        THIS METHOD ALLOW USERS TO GET THE DIARY NOTES IN THEIR TRASH
+
+        DESCRIPTION:
+            - The most recently trashed notes come first
+        """
+        trashed_notes = DiaryNote.get_trash(user=request.user).order_by(
+            "-deleted_at", "-id"
+        )
+
+        paginator = CustomPagination()
+        result_page = paginator.paginate_queryset(trashed_notes, request)
+        serializer = DiaryNoteTrashSerializer(result_page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        response.data["user"] = UserSerializer(request.user).data
+
+        return response
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Move many Diary Notes to the trash",
+        request_body=trash_schema,
+        responses=trash_response_schema,
+    )
+    def post(self, request):
+        """
+        THIS METHOD ALLOW USERS TO MOVE MANY DIARY NOTES TO THE TRASH
+
+        DESCRIPTION:
+            - Up to 1000 notes are moved with a single statement
+            - Trashed notes are left out of every note list and purged after
+              NOTE_TRASH_RETENTION_DAYS days
+        """
+        serializer = NoteTrashSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        note_ids = DiaryNote.trash_notes(
+            user=request.user, ids=serializer.validated_data.get("ids")
+        )
+
+        return Response({"updated": len(note_ids)}, status=status.HTTP_200_OK)
+
+
+class DiaryNoteRestoreApiView(APIView):
+    """
+    DIARY NOTE RESTORE API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = COMPRESSED_BODY_PARSERS
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Restore many Diary Notes from the trash",
+        request_body=DiaryNoteTrashApiView.trash_schema,
+        responses=DiaryNoteTrashApiView.trash_response_schema,
+    )
+    def post(self, request):
+        """
+        THIS METHOD ALLOW USERS TO RESTORE MANY DIARY NOTES FROM THE TRASH
+
+        DESCRIPTION:
+            - Up to 1000 notes are restored with a single statement
+        """
+        serializer = NoteTrashSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        note_ids = DiaryNote.restore_notes(
+            user=request.user, ids=serializer.validated_data.get("ids")
+        )
+
+        return Response({"updated": len(note_ids)}, status=status.HTTP_200_OK)
+
+
+class DiaryNoteChangesApiView(APIView):
+    """
+    DIARY NOTE CHANGES API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    since_param = openapi.Parameter(
+        "since",
+        openapi.IN_QUERY,
+        description="next_token of the previous sync, omit it for a full sync",
+        type=openapi.TYPE_STRING,
+    )
+
+    changes_response_schema = {
+        status.HTTP_200_OK: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "changes": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+                "tombstones": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                            "deleted_at": openapi.Schema(type=openapi.TYPE_STRING),
+                        },
+                    ),
+                ),
+                "next_token": openapi.Schema(type=openapi.TYPE_STRING),
+                "has_more": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+            },
+        ),
+        status.HTTP_400_BAD_REQUEST: "Bad Request",
+        status.HTTP_410_GONE: "The sync token expired",
+    }
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["diary-note"],
+        operation_description="Get the Diary Notes changed since a sync token",
+        manual_parameters=[since_param],
+        responses=changes_response_schema,
+    )
+    def get(self, request):
+        """
+        THIS METHOD ALLOW USERS TO SYNC THEIR DIARY NOTES INCREMENTALLY
+
+        DESCRIPTION:
+            - Without since every note is returned, with the next_token of the previous
+              response only the notes created or updated since then
+            - changes are ordered by updated_at then id and carry the full content, trashed
+              notes are included with their deleted_at
+            - tombstones list the ids of the notes deleted since the token
+            - At most NOTE_SYNC_PAGE_SIZE changes and tombstones are returned, has_more tells
+              the client to call again right away with next_token
+            - A token older than NOTE_DELETION_LOG_RETENTION_DAYS returns 410 Gone, the
+              client then runs a full sync
+            - Writes are stamped before they commit, the changes and tombstones of the
+              last NOTE_SYNC_SAFETY_LAG seconds are sent again by the next sync so a
+              late commit is not skipped
+        """
+        page_size = settings.NOTE_SYNC_PAGE_SIZE
+        since = request.GET.get("since")
+        horizon = timezone.now() - timedelta(seconds=settings.NOTE_SYNC_SAFETY_LAG)
+
+        if since:
+            try:
+                token = decode_sync_token(since)
+            except ValueError:
+                return Response(
+                    {"message": "Invalid sync token"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            retention = timedelta(days=settings.NOTE_DELETION_LOG_RETENTION_DAYS)
+            if token.issued_at < timezone.now() - retention:
+                return Response(
+                    {"message": "The sync token expired, run a full sync"},
+                    status=status.HTTP_410_GONE,
+                )
+        else:
+            token = initial_sync_token(
+                NoteDeletion.get_last_id(user=request.user, before=horizon)
+            )
+
+        notes = list(
+            DiaryNote.get_changes(user=request.user, after=token.after)[: page_size + 1]
+        )
+        tombstones = list(
+            NoteDeletion.get_tombstones(user=request.user, after_id=token.deletion_id)[
+                : page_size + 1
+            ]
+        )
+        has_more_notes = len(notes) > page_size
+        has_more_tombstones = len(tombstones) > page_size
+        notes = notes[:page_size]
+        tombstones = tombstones[:page_size]
+
+        # the last page doesn't move the token past the horizon, pages before it
+        # keep going so a burst of writes can't stall the client
+        after = token.after
+        if notes:
+            after = (notes[-1].updated_at, notes[-1].id)
+        if not has_more_notes and after is not None and after[0] > horizon:
+            after = (horizon, 0)
+
+        deletion_id = token.deletion_id
+        for tombstone in tombstones:
+            if not has_more_tombstones and tombstone.deleted_at > horizon:
+                break
+            deletion_id = tombstone.id
+
+        # every deletion up to the horizon has been sent, older log entries are not
+        # needed
+        issued_at = token.issued_at if has_more_tombstones else horizon
+
+        next_token = SyncToken(after, deletion_id, issued_at)
+
+        return Response(
+            {
+                "changes": DiaryNoteSyncSerializer(notes, many=True).data,
+                "tombstones": NoteTombstoneSerializer(tombstones, many=True).data,
+                "next_token": encode_sync_token(next_token),
+                "has_more": has_more_notes or has_more_tombstones,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class DashboardApiView(APIView):
+    """
+    DASHBOARD API VIEW
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    limit_param = openapi.Parameter(
+        "limit",
+        openapi.IN_QUERY,
+        description="number of upcoming notes and reminders",
+        type=openapi.TYPE_INTEGER,
+    )
+
+    dashboard_response_schema = {
+        status.HTTP_200_OK: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "status": openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "total": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "unfinished": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "done": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "overdue": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    },
+                ),
+                "priority": openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        level: openapi.Schema(type=openapi.TYPE_INTEGER)
+                        for level, _ in DiaryNote.PRIORITY_LEVELS
+                    },
+                ),
+                "categories": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                            "name": openapi.Schema(type=openapi.TYPE_STRING),
+                            "count": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        },
+                    ),
+                ),
+                "upcoming_notes": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+                "upcoming_reminders": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                ),
+            },
+        ),
+        status.HTTP_400_BAD_REQUEST: "Bad Request",
+    }
+
+    @method_decorator(csrf_exempt)
+    @swagger_auto_schema(
+        tags=["dashboard"],
+        operation_description="Get the Dashboard Summary",
+        manual_parameters=[limit_param],
+        responses=dashboard_response_schema,
+    )
+    def get(self, request):
+        """
+        THIS METHOD ALLOW USERS TO GET A SUMMARY OF THEIR DIARY NOTES
+
+        DESCRIPTION:
+            - status counts the notes by total, unfinished, done and overdue, priority
+              counts them by priority level, trashed notes are not counted
+            - categories counts the notes of each category that has any
+            - upcoming_notes are the next unfinished notes due today or later,
+              upcoming_reminders the next reminders starting today or later
+            - limit sets how many upcoming notes and reminders are returned, it defaults
+              to DASHBOARD_UPCOMING_LIMIT and is capped at DASHBOARD_UPCOMING_MAX_LIMIT
+            - The summary takes four queries whatever the number of notes
+        """
+        query_serializer = DashboardQuerySerializer(data=request.GET.dict())
+        query_serializer.is_valid(raise_exception=True)
+        limit = query_serializer.validated_data.get(
+            "limit", settings.DASHBOARD_UPCOMING_LIMIT
+        )
+
+        counts = DiaryNote.get_status_counts(user=request.user)
+        category_counts = DiaryNote.get_category_counts(user=request.user)
+        categories = category_registry.in_bulk(category_counts)
+        upcoming_notes = DiaryNote.get_upcoming(user=request.user, limit=limit)
+        upcoming_reminders = NoteReminder.get_upcoming(user=request.user, limit=limit)
+
+        return Response(
+            {
+                "status": {
+                    name: counts[name]
+                    for name in ("total", "unfinished", "done", "overdue")
+                },
+                "priority": {
+                    level: counts[level] for level, _ in DiaryNote.PRIORITY_LEVELS
+                },
+                "categories": [
+                    {
+                        "id": category.id,
+                        "name": category.name,
+                        "count": category_counts[category.id],
+                    }
+                    for category in sorted(
+                        categories.values(), key=lambda category: category.id
+                    )
+                ],
+                "upcoming_notes": DiaryNoteListSerializer(
+                    upcoming_notes, many=True
+                ).data,
+                "upcoming_reminders": UpcomingReminderSerializer(
+                    upcoming_reminders, many=True
+                ).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def get_event_stream_user(request):
+    """
+    Authenticate an event stream request with an access token
+
+    Browsers' EventSource can't send headers, so the token is read from the
+    Authorization header or, failing that, from the token query parameter.
+
+    Returns:
+        User: the authenticated user, None when the token is missing or invalid
+    """
+    authenticator = JWTAuthentication()
+
+    raw_token = None
+    header = authenticator.get_header(request)
+    if header is not None:
+        raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        raw_token = request.GET.get("token")
+    if not raw_token:
+        return None
+
+    try:
+        validated_token = authenticator.get_validated_token(raw_token)
+        return authenticator.get_user(validated_token)
+    except exceptions.AuthenticationFailed:
+        # InvalidToken is an AuthenticationFailed too
+        return None
+
+
+async def stream_events(subscription):
+    """
+    Server-Sent Events body of a subscription, with keep-alive comments while idle
+    """
+    try:
+        yield f"retry: {settings.NOTE_EVENTS_HEARTBEAT_INTERVAL * 1000}\n\n"
+
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), settings.NOTE_EVENTS_HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield format_event(event)
+    finally:
+        subscription.close()
+
+
+async def note_events(request):
+    """
+    THIS VIEW STREAMS THE CHANGES OF THE USER'S NOTES AND REMINDERS
+
+    DESCRIPTION:
+        - A text/event-stream response that stays open, meant to be served through ASGI
+        - Authenticated with an access token in the Authorization header or the token
+          query parameter
+        - Every saved or deleted note or reminder sends a note / reminder event with
+          {"model", "action": "save" | "delete", "ids"}, clients then fetch what changed,
+          e.g. through the delta sync endpoint
+        - A stream event with action overflow means events were dropped, the client
+          resyncs
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    user = await sync_to_async(get_event_stream_user)(request)
+    if user is None:
+        return JsonResponse(
+            {"message": "Authentication credentials were not provided or are invalid"},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+
+    subscription = get_event_broker().subscribe(user.id)
+
+    response = StreamingHttpResponse(
+        stream_events(subscription), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # keep reverse proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 class DownloadNoteToFile(APIView):
     """
     DOWNLOAD NOTE TO FILE API VIEW
@@ -504,6 +1435,7 @@ class DownloadNoteToFile(APIView):
         tags=["download"],
         operation_description="Create Diary Note",
     )
+    @idempotent
     def get(self, request):
         users_notes = DiaryNote.get_all(user=request.user)
         note_ids = list(users_notes.values_list("id", flat=True))
@@ -540,6 +1472,7 @@ class DownloadNoteToFile(APIView):
         request_body=download_note_schema,
         responses=download_note_response_schema,
     )
+    @idempotent
     def post(self, request):
         serializer = DownloadNoteSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -674,7 +1607,9 @@ class NoteReminderApiView(APIView):
         reminder_message = serializer.validated_data.get("reminder_message")
 
         try:
-            note = DiaryNote.objects.get(id=note_id, owner=request.user)
+            note = DiaryNote.objects.get(
+                id=note_id, owner=request.user, deleted_at__isnull=True
+            )
         except DiaryNote.DoesNotExist:
             return Response(
                 {"message": "Diary Note does not exist"},
@@ -690,7 +1625,9 @@ class NoteReminderApiView(APIView):
 
         note_reminder = NoteReminder.objects.create(**payload)
 
-        data = NoteReminderSerializer(note_reminder).data
+        data = NoteReminderSerializer(
+            note_reminder, **get_projection_kwargs(request)
+        ).data
 
         return Response(data, status=status.HTTP_201_CREATED)
 
@@ -724,7 +1661,9 @@ class NoteReminderApiView(APIView):
         note_reminder.reminder_message = reminder_message
         note_reminder.save()
 
-        data = NoteReminderSerializer(note_reminder).data
+        data = NoteReminderSerializer(
+            note_reminder, **get_projection_kwargs(request)
+        ).data
 
         return Response(data, status=status.HTTP_201_CREATED)
 
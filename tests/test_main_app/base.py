@@ -0,0 +1,88 @@
+import os
+import tempfile
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from account.models import User
+from main.helpers.cache_helper import SHARED_CACHE_ALIAS
+from main.models import Category, DiaryNote
+
+# a file cache stands in for the Redis every worker shares, switch_worker leaves
+# it alone
+SHARED_CACHES = {
+    **settings.CACHES,
+    SHARED_CACHE_ALIAS: {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "diary-shared-cache-tests"),
+    },
+}
+
+
+def create_user(email="test@example.com", first_name="test"):
+    return User.objects.create_user(
+        email=email,
+        password="iFiyU83h2sdxMdb/$.",
+        first_name=first_name,
+        last_name="user",
+    )
+
+
+def create_note(owner, category, **fields):
+    """
+    Create a diary note, fields default to a low priority note due on 2023-10-01
+    """
+    fields = {
+        "title": "note",
+        "content": "content",
+        "priority": "Low",
+        "due_date": date(2023, 10, 1),
+        **fields,
+    }
+    return DiaryNote.create_note(owner=owner, category=category, **fields)
+
+
+def switch_worker():
+    """
+    Drop the per-process caches, like a request served by another worker
+    """
+    for backend in caches.all():
+        if isinstance(backend, LocMemCache):
+            backend.clear()
+
+
+class NoteTestMixin:
+    """
+    Two users, a Work category and a note factory
+
+    The shared cache is process wide in the tests, it is cleared before each test
+    so no test sees what another one cached.
+    """
+
+    def setUp(self):
+        super().setUp()
+        caches[SHARED_CACHE_ALIAS].clear()
+        self.user = create_user()
+        self.other_user = create_user("other@example.com", "other")
+        self.category = Category.objects.create(name="Work")
+
+    def create_note(self, owner=None, category=None, **fields):
+        return create_note(owner or self.user, category or self.category, **fields)
+
+
+class NoteTestCase(NoteTestMixin, TestCase):
+    pass
+
+
+class NoteAPITestCase(NoteTestMixin, APITestCase):
+    """
+    NoteTestMixin with the client authenticated as the first user
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
@@ -0,0 +1,122 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from main.helpers.cache_helper import SHARED_CACHE_ALIAS
+from main.helpers.category_helper import (
+    CategoryRegistry,
+    bump_category_version,
+    category_registry,
+)
+from main.models import Category
+from tests.test_main_app.base import SHARED_CACHES, NoteAPITestCase, switch_worker
+
+
+class CategoryRegistryTests(TestCase):
+    def setUp(self):
+        caches[SHARED_CACHE_ALIAS].clear()
+        self.work = Category.objects.create(name="Work")
+
+    def test_get_is_served_from_memory(self):
+        category_registry.all()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(category_registry.get(self.work.id).name, "Work")
+            self.assertIsNone(category_registry.get(999))
+            self.assertEqual(
+                category_registry.in_bulk([self.work.id, 999]),
+                {self.work.id: self.work},
+            )
+
+    def test_changes_invalidate_the_local_copy(self):
+        category_registry.all()
+
+        health = Category.objects.create(name="Health")
+        self.assertEqual(category_registry.get(health.id).name, "Health")
+
+        health.name = "Fitness"
+        health.save()
+        self.assertEqual(category_registry.get(health.id).name, "Fitness")
+
+        health.delete()
+        self.assertIsNone(category_registry.get(health.id))
+
+    def test_other_processes_reload_on_a_new_version(self):
+        registry = CategoryRegistry()
+        registry.all()
+
+        # a change made by another process, which only bumps the shared version
+        Category.objects.filter(id=self.work.id).update(name="Office")
+
+        self.assertEqual(registry.get(self.work.id).name, "Work")
+
+        bump_category_version()
+        with override_settings(CATEGORY_REGISTRY_CHECK_INTERVAL=0):
+            self.assertEqual(registry.get(self.work.id).name, "Office")
+
+
+@override_settings(CACHES=SHARED_CACHES, CATEGORY_REGISTRY_CHECK_INTERVAL=0)
+class CategoryRegistryWorkersTests(TestCase):
+    def setUp(self):
+        caches[SHARED_CACHE_ALIAS].clear()
+        self.work = Category.objects.create(name="Work")
+
+    def test_other_workers_keep_their_copy_while_nothing_changed(self):
+        bump_category_version()
+        registry = CategoryRegistry()
+        registry.all()
+
+        # not a category change, the version stays as it is
+        Category.objects.filter(id=self.work.id).update(name="Office")
+        switch_worker()
+
+        self.assertEqual(registry.get(self.work.id).name, "Work")
+
+    def test_other_workers_see_the_new_version(self):
+        registry = CategoryRegistry()
+        registry.all()
+
+        # another worker renames the category and bumps the version on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.filter(id=self.work.id).update(name="Office")
+            category_registry.invalidate()
+        switch_worker()
+
+        self.assertEqual(registry.get(self.work.id).name, "Office")
+
+
+class NoteCategoryJoinTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        category_registry.all()
+        self.create_note()
+
+    def test_note_list_does_not_join_categories(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("note-list"))
+
+        self.assertEqual(response.data["results"][0]["category"]["name"], "Work")
+        for query in queries.captured_queries:
+            self.assertNotIn("main_category", query["sql"])
+
+    def test_create_validates_the_category_from_memory(self):
+        payload = {
+            "title": "note",
+            "content": "content",
+            "priority_level": "Low",
+            "category": self.category.id,
+            "due_date": "2023-10-01",
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("note-list"), payload, format="json")
+
+        self.assertEqual(response.data["category"]["name"], "Work")
+        for query in queries.captured_queries:
+            self.assertNotIn('FROM "main_category"', query["sql"])
+
+        payload["category"] = 999
+        response = self.client.post(reverse("note-list"), payload, format="json")
+        self.assertEqual(response.data["message"], "Category does not exist")
@@ -0,0 +1,76 @@
+import gzip
+import json
+import unittest
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.compression_helper import zstandard
+from main.models import DiaryNote
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class CompressedRequestBodyTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("note-bulk-create")
+
+        note = {
+            "title": "note",
+            "content": "a long journal entry " * 200,
+            "priority_level": "Low",
+            "category": self.category.id,
+            "due_date": "2023-10-01",
+        }
+        self.body = json.dumps({"notes": [note] * 20}).encode("utf-8")
+
+    def post(self, body, encoding):
+        return self.client.generic(
+            "POST",
+            self.url,
+            body,
+            content_type="application/json",
+            HTTP_CONTENT_ENCODING=encoding,
+        )
+
+    def test_gzip_body(self):
+        compressed = gzip.compress(self.body)
+        self.assertLess(len(compressed), len(self.body) // 10)
+
+        response = self.post(compressed, "gzip")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(DiaryNote.objects.count(), 20)
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd_body(self):
+        compressed = zstandard.ZstdCompressor().compress(self.body)
+
+        response = self.post(compressed, "zstd")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_decompressed_size_limit(self):
+        with override_settings(REQUEST_BODY_MAX_DECOMPRESSED_SIZE=1024):
+            response = self.post(gzip.compress(self.body), "gzip")
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(DiaryNote.objects.exists())
+
+    def test_invalid_body(self):
+        response = self.post(gzip.compress(self.body)[:100], "gzip")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post(self.body, "gzip")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unsupported_encoding(self):
+        response = self.post(self.body, "br")
+
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    def test_uncompressed_body(self):
+        response = self.post(self.body, "identity")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
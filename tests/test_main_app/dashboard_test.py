@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from main.helpers.category_helper import category_registry
+from main.models import Category, DiaryNote, NoteReminder
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class DashboardTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.health = Category.objects.create(name="Health")
+        Category.objects.create(name="Travel")
+        category_registry.all()
+        self.today = timezone.localdate()
+        self.url = reverse("dashboard")
+
+    def create_note(self, title, days, **fields):
+        return super().create_note(
+            title=title,
+            content=f"{title} content",
+            due_date=self.today + timedelta(days=days),
+            **fields,
+        )
+
+    def create_reminder(self, note, days):
+        return NoteReminder.objects.create(
+            note=note,
+            start_date=self.today + timedelta(days=days),
+            reminder_interval="Daily",
+            reminder_message=f"remember {note.title}",
+        )
+
+    def get_dashboard(self, params=None):
+        response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_counts(self):
+        self.create_note("later", 3, priority="High")
+        self.create_note("overdue", -2, due=True)
+        self.create_note("done", 1, category=self.health, is_finished=True)
+        trashed = self.create_note("trashed", 1, priority="Medium")
+        DiaryNote.trash_notes(self.user, [trashed.id])
+        self.create_note("other", 1, owner=self.other_user)
+
+        data = self.get_dashboard()
+
+        self.assertEqual(
+            data["status"], {"total": 3, "unfinished": 2, "done": 1, "overdue": 1}
+        )
+        self.assertEqual(data["priority"], {"Low": 2, "Medium": 0, "High": 1})
+        self.assertEqual(
+            data["categories"],
+            [
+                {"id": self.category.id, "name": "Work", "count": 2},
+                {"id": self.health.id, "name": "Health", "count": 1},
+            ],
+        )
+
+    def test_upcoming_notes_and_reminders(self):
+        later = self.create_note("later", 3)
+        soon = self.create_note("soon", 1)
+        self.create_note("overdue", -2, due=True)
+        self.create_note("done", 0, is_finished=True)
+        self.create_reminder(later, 2)
+        self.create_reminder(soon, 0)
+        self.create_reminder(soon, -1)
+        self.create_reminder(self.create_note("other", 1, owner=self.other_user), 1)
+
+        data = self.get_dashboard()
+
+        self.assertEqual(
+            [note["title"] for note in data["upcoming_notes"]], ["soon", "later"]
+        )
+        self.assertNotIn("content", data["upcoming_notes"][0])
+        self.assertEqual(
+            [reminder["note_title"] for reminder in data["upcoming_reminders"]],
+            ["soon", "later"],
+        )
+        self.assertEqual(data["upcoming_reminders"][0]["note_id"], soon.id)
+
+    def test_limit(self):
+        for index in range(4):
+            self.create_reminder(self.create_note(f"note {index}", index), index)
+
+        data = self.get_dashboard({"limit": 2})
+
+        self.assertEqual(len(data["upcoming_notes"]), 2)
+        self.assertEqual(len(data["upcoming_reminders"]), 2)
+
+    @override_settings(DASHBOARD_UPCOMING_LIMIT=1, DASHBOARD_UPCOMING_MAX_LIMIT=3)
+    def test_limit_defaults_and_is_capped(self):
+        for index in range(4):
+            self.create_note(f"note {index}", index)
+
+        self.assertEqual(len(self.get_dashboard()["upcoming_notes"]), 1)
+        self.assertEqual(len(self.get_dashboard({"limit": 10})["upcoming_notes"]), 3)
+
+    def test_invalid_limit(self):
+        response = self.client.get(self.url, {"limit": 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_budget_does_not_grow_with_the_notes(self):
+        for index in range(20):
+            note = self.create_note(
+                f"note {index}",
+                index,
+                category=self.health if index % 2 else self.category,
+                priority=DiaryNote.PRIORITY_LEVELS[index % 3][0],
+            )
+            self.create_reminder(note, index)
+
+        with self.assertNumQueries(4):
+            data = self.get_dashboard()
+
+        self.assertEqual(data["status"]["total"], 20)
+        self.assertEqual(len(data["upcoming_reminders"]), 5)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from main.models import DiaryNote, IdempotencyKey
+from tests.test_main_app.base import NoteAPITestCase, switch_worker
+
+
+class IdempotencyKeyTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("note-list")
+        self.payload = {
+            "title": "note",
+            "content": "content",
+            "priority_level": "Low",
+            "category": self.category.id,
+            "due_date": "2023-10-01",
+        }
+
+    def post_note(self, payload, key=None):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+        return self.client.post(self.url, payload, format="json", **headers)
+
+    def test_retry_replays_the_first_response(self):
+        first = self.post_note(self.payload, key="key-1")
+        retry = self.post_note(self.payload, key="key-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(DiaryNote.objects.count(), 1)
+
+    def test_retry_reaching_another_worker_is_replayed(self):
+        first = self.post_note(self.payload, key="key-1")
+        switch_worker()
+        retry = self.post_note(self.payload, key="key-1")
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(DiaryNote.objects.count(), 1)
+
+    def test_retry_while_the_first_request_runs(self):
+        self.post_note(self.payload, key="key-1")
+        # the first attempt has claimed the key but not answered yet
+        IdempotencyKey.objects.update(response=None, status_code=None)
+
+        response = self.post_note(self.payload, key="key-1")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(DiaryNote.objects.count(), 1)
+
+    def test_expired_key_can_be_used_again(self):
+        self.post_note(self.payload, key="key-1")
+        IdempotencyKey.objects.update(
+            created_at=timezone.now()
+            - timedelta(seconds=settings.IDEMPOTENCY_KEY_TIMEOUT + 1)
+        )
+
+        response = self.post_note(self.payload, key="key-1")
+
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(DiaryNote.objects.count(), 2)
+
+    def test_requests_without_a_key_are_not_deduplicated(self):
+        self.post_note(self.payload)
+        self.post_note(self.payload)
+
+        self.assertEqual(DiaryNote.objects.count(), 2)
+
+    def test_key_reused_for_another_request(self):
+        self.post_note(self.payload, key="key-1")
+        response = self.post_note({**self.payload, "title": "other"}, key="key-1")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(DiaryNote.objects.count(), 1)
+
+    def test_failed_responses_are_not_kept(self):
+        response = self.post_note({**self.payload, "category": 999}, key="key-1")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post_note({**self.payload, "category": 999}, key="key-1")
+        self.assertEqual(response.data["message"], "Category does not exist")
+        self.assertNotIn("Idempotent-Replayed", response)
+
+    def test_keys_are_scoped_to_the_user(self):
+        self.post_note(self.payload, key="key-1")
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.post_note(self.payload, key="key-1")
+
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(DiaryNote.objects.filter(owner=self.other_user).count(), 1)
+
+    @mock.patch("main.views.celery_send_diary_note_as_a_file")
+    def test_export_runs_once(self, send_file):
+        url = reverse("download-note")
+        payload = {"note_ids": [1, 2], "file_type": "csv"}
+
+        for _ in range(3):
+            response = self.client.post(
+                url, payload, format="json", HTTP_IDEMPOTENCY_KEY="export-1"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        send_file.assert_called_once()
@@ -0,0 +1,52 @@
+from django.urls import reverse
+from rest_framework import status
+
+from main.serializers import NoteBatchGetSerializer
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteBatchGetApiViewTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("note-batch-get")
+
+        self.notes = [self.create_note(self.user) for _ in range(3)]
+        self.other_note = self.create_note(self.other_user)
+
+    def test_batch_get_in_requested_order(self):
+        ids = [self.notes[2].id, self.notes[0].id, self.notes[2].id]
+
+        # the first request of a process loads the category registry
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, {"ids": ids}, format="json")
+        with self.assertNumQueries(1):
+            self.client.post(self.url, {"ids": ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]],
+            [self.notes[2].id, self.notes[0].id],
+        )
+        self.assertEqual(response.json()["missing"], [])
+
+    def test_batch_get_reports_missing_ids(self):
+        ids = [self.notes[0].id, self.other_note.id, 999999]
+
+        response = self.client.post(self.url, {"ids": ids}, format="json")
+
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]], [self.notes[0].id]
+        )
+        self.assertEqual(response.json()["missing"], [self.other_note.id, 999999])
+
+    def test_batch_get_is_capped(self):
+        ids = list(range(1, NoteBatchGetSerializer.MAX_IDS + 2))
+
+        response = self.client.post(self.url, {"ids": ids}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_get_requires_ids(self):
+        response = self.client.post(self.url, {"ids": []}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,100 @@
+from django.urls import reverse
+from rest_framework import status
+
+from main.models import Category, DiaryNote
+from main.serializers import BulkCreateDiaryNoteSerializer
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteBulkCreateApiViewTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.health = Category.objects.create(name="Health")
+        self.url = reverse("note-bulk-create")
+
+    def note_payload(self, index, category, priority="Low"):
+        return {
+            "title": f"note {index}",
+            "content": "content",
+            "priority_level": priority,
+            "category": category.id,
+            "due_date": "2023-10-01",
+        }
+
+    def test_bulk_create(self):
+        notes = [
+            self.note_payload(0, self.category, "High"),
+            self.note_payload(1, self.health),
+            self.note_payload(2, self.category, "Medium"),
+        ]
+
+        response = self.client.post(self.url, {"notes": notes}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [note["title"] for note in response.data["results"]],
+            ["note 0", "note 1", "note 2"],
+        )
+        self.assertEqual(response.data["results"][1]["category"]["name"], "Health")
+        self.assertEqual(response.data["user"]["email"], self.user.email)
+
+        created = DiaryNote.objects.filter(owner=self.user).order_by("title")
+        self.assertEqual(
+            [(note.priority, note.priority_rank) for note in created],
+            [("High", 2), ("Low", 0), ("Medium", 1)],
+        )
+
+    def test_bulk_create_query_count(self):
+        notes = [
+            self.note_payload(index, [self.category, self.health][index % 2])
+            for index in range(50)
+        ]
+
+        # category lookup and insert, plus the savepoint and its release
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, {"notes": notes}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(DiaryNote.objects.filter(owner=self.user).count(), 50)
+
+    def test_per_item_errors(self):
+        notes = [
+            self.note_payload(0, self.category),
+            {**self.note_payload(1, self.category), "priority_level": "Urgent"},
+            {**self.note_payload(2, self.category), "category": 999},
+        ]
+
+        response = self.client.post(self.url, {"notes": notes}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["notes"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("priority_level", errors[1])
+        self.assertEqual(errors[2], {})
+        self.assertFalse(DiaryNote.objects.exists())
+
+        notes[1]["priority_level"] = "Low"
+        response = self.client.post(self.url, {"notes": notes}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["notes"],
+            [{}, {}, {"category": ["Category does not exist"]}],
+        )
+        self.assertFalse(DiaryNote.objects.exists())
+
+    def test_too_many_notes(self):
+        notes = [
+            self.note_payload(index, self.category)
+            for index in range(BulkCreateDiaryNoteSerializer.MAX_NOTES + 1)
+        ]
+
+        response = self.client.post(self.url, {"notes": notes}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(DiaryNote.objects.exists())
+
+    def test_empty_list(self):
+        response = self.client.post(self.url, {"notes": []}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,97 @@
+from django.urls import reverse
+from rest_framework import status
+
+from main.models import Category, DiaryNote
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteBulkUpdateApiViewTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.health = Category.objects.create(name="Health")
+        self.url = reverse("note-bulk-update")
+
+        self.notes = [self.create_note(self.user) for _ in range(5)]
+        self.other_note = self.create_note(self.other_user)
+
+    def test_mark_all_done_is_one_update(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                self.url, {"filter": {}, "is_finished": True}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 5)
+        self.assertEqual(
+            DiaryNote.objects.filter(owner=self.user, is_finished=True).count(), 5
+        )
+        self.other_note.refresh_from_db()
+        self.assertFalse(self.other_note.is_finished)
+
+    def test_update_by_ids(self):
+        ids = [self.notes[0].id, self.notes[2].id, self.other_note.id]
+
+        response = self.client.post(
+            self.url, {"ids": ids, "priority": "High"}, format="json"
+        )
+
+        self.assertEqual(response.data["updated"], 2)
+        updated = DiaryNote.objects.filter(priority="High")
+        self.assertEqual(
+            sorted(updated.values_list("id", flat=True)),
+            [self.notes[0].id, self.notes[2].id],
+        )
+        self.assertEqual(set(updated.values_list("priority_rank", flat=True)), {2})
+
+    def test_update_by_filter(self):
+        health_note = self.create_note(self.user, category=self.health)
+
+        response = self.client.post(
+            self.url,
+            {"filter": {"category": self.health.id}, "is_finished": True},
+            format="json",
+        )
+
+        self.assertEqual(response.data["updated"], 1)
+        health_note.refresh_from_db()
+        self.assertTrue(health_note.is_finished)
+
+    def test_move_category_and_return_rows(self):
+        ids = [self.notes[1].id, self.notes[3].id]
+
+        response = self.client.post(
+            self.url,
+            {"ids": ids, "category": self.health.id, "return_rows": True},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([note["id"] for note in response.data["results"]], ids)
+        self.assertEqual(
+            {note["category"]["name"] for note in response.data["results"]},
+            {"Health"},
+        )
+
+    def test_updated_notes_leave_the_detail_cache(self):
+        note = self.notes[0]
+        detail_url = reverse("note-detail", kwargs={"note_id": note.id})
+        self.client.get(detail_url)
+
+        self.client.post(
+            self.url, {"ids": [note.id], "is_finished": True}, format="json"
+        )
+
+        self.assertTrue(self.client.get(detail_url).data["is_finished"])
+
+    def test_invalid_requests(self):
+        for payload in [
+            {"is_finished": True},
+            {"ids": [1], "filter": {}, "is_finished": True},
+            {"ids": [self.notes[0].id]},
+            {"ids": [self.notes[0].id], "category": 999},
+            {"filter": {"filter_by": "done", "is_finished": False}, "due": True},
+        ]:
+            response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertFalse(DiaryNote.objects.filter(is_finished=True).exists())
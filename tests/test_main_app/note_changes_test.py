@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from main.helpers.category_helper import category_registry
+from main.helpers.sync_helper import SyncToken, encode_sync_token
+from main.models import DiaryNote, NoteDeletion
+from tests.test_main_app.base import NoteAPITestCase
+
+
+# every write of the tests is committed at once
+@override_settings(NOTE_SYNC_SAFETY_LAG=0)
+class NoteChangesTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        category_registry.all()
+        self.notes = [self.create_note(f"note {index}") for index in range(3)]
+        self.url = reverse("note-changes")
+
+    def create_note(self, title, owner=None):
+        return super().create_note(owner, title=title, content=f"{title} content")
+
+    def sync(self, token=None):
+        params = {"since": token} if token is not None else {}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_full_sync(self):
+        self.create_note("other", owner=self.other_user)
+
+        data = self.sync()
+
+        self.assertEqual(
+            [note["id"] for note in data["changes"]], [note.id for note in self.notes]
+        )
+        self.assertEqual(data["changes"][0]["content"], "note 0 content")
+        self.assertEqual(data["tombstones"], [])
+        self.assertFalse(data["has_more"])
+
+    def test_full_sync_skips_old_deletions(self):
+        self.notes[0].delete()
+
+        data = self.sync()
+
+        self.assertEqual(len(data["changes"]), 2)
+        self.assertEqual(data["tombstones"], [])
+
+    def test_nothing_changed(self):
+        token = self.sync()["next_token"]
+
+        with self.assertNumQueries(2):
+            data = self.sync(token)
+
+        self.assertEqual(data["changes"], [])
+        self.assertEqual(data["tombstones"], [])
+
+    def test_returns_only_what_changed(self):
+        token = self.sync()["next_token"]
+
+        DiaryNote.update_note(self.user, self.notes[1].id, title="renamed")
+        created = self.create_note("new")
+        DiaryNote.trash_notes(self.user, [self.notes[2].id])
+        deleted_id = self.notes[0].id
+        self.notes[0].delete()
+
+        data = self.sync(token)
+
+        changes = {note["id"]: note for note in data["changes"]}
+        self.assertEqual(
+            list(changes), [self.notes[1].id, created.id, self.notes[2].id]
+        )
+        self.assertEqual(changes[self.notes[1].id]["title"], "renamed")
+        self.assertIsNotNone(changes[self.notes[2].id]["deleted_at"])
+        self.assertEqual([item["id"] for item in data["tombstones"]], [deleted_id])
+
+        data = self.sync(data["next_token"])
+        self.assertEqual(data["changes"], [])
+        self.assertEqual(data["tombstones"], [])
+
+    @override_settings(NOTE_SYNC_PAGE_SIZE=2)
+    def test_pages_until_caught_up(self):
+        data = self.sync()
+        self.assertTrue(data["has_more"])
+        ids = [note["id"] for note in data["changes"]]
+
+        data = self.sync(data["next_token"])
+        self.assertFalse(data["has_more"])
+        ids.extend(note["id"] for note in data["changes"])
+
+        self.assertEqual(ids, [note.id for note in self.notes])
+
+    @override_settings(NOTE_SYNC_SAFETY_LAG=60)
+    def test_late_commits_are_not_skipped(self):
+        token = self.sync()["next_token"]
+
+        # stamped before the sync, committed after it
+        DiaryNote.objects.filter(id=self.notes[0].id).update(
+            title="late", updated_at=timezone.now() - timedelta(seconds=5)
+        )
+
+        changes = {note["id"]: note for note in self.sync(token)["changes"]}
+        self.assertEqual(changes[self.notes[0].id]["title"], "late")
+
+    @override_settings(NOTE_SYNC_SAFETY_LAG=60)
+    def test_recent_deletions_are_sent_again(self):
+        deleted_id = self.notes[0].id
+        self.notes[0].delete()
+
+        data = self.sync()
+        self.assertEqual([item["id"] for item in data["tombstones"]], [deleted_id])
+
+        data = self.sync(data["next_token"])
+        self.assertEqual([item["id"] for item in data["tombstones"]], [deleted_id])
+
+    @override_settings(NOTE_SYNC_SAFETY_LAG=60, NOTE_SYNC_PAGE_SIZE=2)
+    def test_recent_changes_dont_stall_paging(self):
+        data = self.sync()
+        self.assertTrue(data["has_more"])
+
+        data = self.sync(data["next_token"])
+        self.assertFalse(data["has_more"])
+        self.assertEqual([note["id"] for note in data["changes"]], [self.notes[2].id])
+
+    def test_deletions_are_logged(self):
+        note_id = self.notes[0].id
+        self.notes[0].delete()
+
+        deletion = NoteDeletion.objects.get(note_id=note_id)
+        self.assertEqual(deletion.owner_id, self.user.id)
+
+    def test_invalid_token(self):
+        response = self.client.get(self.url, {"since": "not-a-token"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_token(self):
+        token = encode_sync_token(
+            SyncToken(None, 0, timezone.now() - timedelta(days=365))
+        )
+
+        response = self.client.get(self.url, {"since": token})
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
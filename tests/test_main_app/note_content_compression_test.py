@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from main.fields import set_postgres_column_compression
+from main.models import DiaryNote
+
+
+class PostgresColumnCompressionTests(SimpleTestCase):
+    def schema_editor(self, vendor, pg_version=150000):
+        schema_editor = mock.Mock()
+        schema_editor.connection.vendor = vendor
+        schema_editor.connection.pg_version = pg_version
+        schema_editor.quote_name = lambda name: f'"{name}"'
+        return schema_editor
+
+    def test_content_column_switches_to_lz4(self):
+        schema_editor = self.schema_editor("postgresql")
+
+        set_postgres_column_compression(schema_editor, DiaryNote, "content")
+
+        self.assertIn(
+            'ALTER TABLE "main_diarynote" ALTER COLUMN "content" SET COMPRESSION lz4',
+            schema_editor.execute.call_args.args[0],
+        )
+
+    def test_other_databases_are_left_alone(self):
+        for vendor, pg_version in [("sqlite", 0), ("postgresql", 130000)]:
+            with self.subTest(vendor=vendor, pg_version=pg_version):
+                schema_editor = self.schema_editor(vendor, pg_version)
+
+                set_postgres_column_compression(schema_editor, DiaryNote, "content")
+
+                schema_editor.execute.assert_not_called()
@@ -0,0 +1,95 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.delta_helper import apply_content_delta, content_hash
+from main.models import DiaryNote
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class ApplyContentDeltaTests(SimpleTestCase):
+    def test_operations_apply_in_order(self):
+        delta = [
+            {"offset": 0, "delete": 5, "insert": "Goodbye"},
+            {"offset": 7, "insert": ","},
+            {"offset": 14, "delete": 1},
+        ]
+
+        self.assertEqual(apply_content_delta("Hello world!", delta), "Goodbye, world")
+
+    def test_offsets_count_characters(self):
+        self.assertEqual(
+            apply_content_delta(
+                "café ☕", [{"offset": 5, "delete": 1, "insert": "🍵"}]
+            ),
+            "café 🍵",
+        )
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            apply_content_delta("short", [{"offset": 3, "delete": 5}])
+
+
+class NoteContentDeltaPatchTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.content = "Dear diary, " + "today was long. " * 500
+        self.note = self.create_note(content=self.content)
+        self.url = f"{reverse('note-list')}?note_id={self.note.id}"
+
+    def patch(self, payload):
+        return self.client.patch(self.url, payload, format="json")
+
+    def test_delta_is_applied(self):
+        response = self.patch(
+            {
+                "base_hash": content_hash(self.content),
+                "content_delta": [{"offset": 5, "delete": 5, "insert": "journal"}],
+                "title": "renamed",
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        expected = "Dear journal, " + "today was long. " * 500
+        self.assertEqual(response.data["content"], expected)
+        self.note.refresh_from_db()
+        self.assertEqual((self.note.title, self.note.content), ("renamed", expected))
+
+    def test_stale_base_hash_is_rejected(self):
+        DiaryNote.objects.filter(id=self.note.id).update(content="edited elsewhere")
+
+        response = self.patch(
+            {
+                "base_hash": content_hash(self.content),
+                "content_delta": [{"offset": 0, "insert": "x"}],
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["content_hash"], content_hash("edited elsewhere")
+        )
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.content, "edited elsewhere")
+
+    def test_invalid_deltas(self):
+        base_hash = content_hash(self.content)
+        for payload in [
+            {"content_delta": [{"offset": 0, "insert": "x"}]},
+            {
+                "base_hash": base_hash,
+                "content": "whole",
+                "content_delta": [{"offset": 0, "insert": "x"}],
+            },
+            {"base_hash": base_hash, "content_delta": [{"offset": -1}]},
+            {
+                "base_hash": base_hash,
+                "content_delta": [{"offset": len(self.content), "delete": 1}],
+            },
+        ]:
+            response = self.patch(payload)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.content, self.content)
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.cache_helper import SHARED_CACHE_ALIAS
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteCountPaginationTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("note-list")
+
+        for index in range(25):
+            self.create_note(title=f"note {index}")
+
+    def get_page(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def drop_cached_pages(self):
+        caches[SHARED_CACHE_ALIAS].clear()
+
+    def test_exact_count_by_default(self):
+        data = self.get_page()
+
+        self.assertEqual(data["count"], 25)
+        self.assertFalse(data["count_is_approximate"])
+
+    def test_count_false_skips_the_count_query(self):
+        # the first request of a process loads the category registry
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {"count": "false"})
+        self.drop_cached_pages()
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {"count": "false"})
+
+        data = self.get_page(count="false")
+        self.assertIsNone(data["count"])
+        self.assertFalse(data["count_is_approximate"])
+        self.assertEqual(len(data["results"]), 10)
+        self.assertIn("page=2", data["next"])
+
+    def test_count_false_walks_every_page(self):
+        titles = []
+        data = self.get_page(count="false", page=1)
+        titles.extend(item["title"] for item in data["results"])
+        while data["next"] is not None:
+            data = self.client.get(data["next"]).json()
+            titles.extend(item["title"] for item in data["results"])
+
+        self.assertEqual(len(titles), 25)
+        self.assertEqual(len(set(titles)), 25)
+
+    def test_count_false_page_past_the_end(self):
+        response = self.client.get(self.url, {"count": "false", "page": 4})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_estimate_is_exact_on_the_last_page(self):
+        with self.assertNumQueries(2):
+            self.get_page(count="estimate", page=3)
+        self.drop_cached_pages()
+        with self.assertNumQueries(1):
+            data = self.get_page(count="estimate", page=3)
+
+        self.assertEqual(data["count"], 25)
+        self.assertFalse(data["count_is_approximate"])
+        self.assertIsNone(data["next"])
+
+    def test_small_estimate_is_replaced_by_an_exact_count(self):
+        with mock.patch(
+            "main.helpers.pagination_helper.estimate_count", return_value=30
+        ):
+            data = self.get_page(count="estimate")
+
+        self.assertEqual(data["count"], 25)
+        self.assertFalse(data["count_is_approximate"])
+
+    def test_large_estimate_is_flagged(self):
+        with mock.patch(
+            "main.helpers.pagination_helper.estimate_count", return_value=5000
+        ):
+            with self.assertNumQueries(2):
+                self.get_page(count="estimate")
+            self.drop_cached_pages()
+            with self.assertNumQueries(1):
+                data = self.get_page(count="estimate")
+
+        self.assertEqual(data["count"], 5000)
+        self.assertTrue(data["count_is_approximate"])
+        self.assertIn("page=2", data["next"])
+
+    def test_unknown_count_mode_counts(self):
+        data = self.get_page(count="maybe")
+
+        self.assertEqual(data["count"], 25)
+
+    def test_category_list_without_count(self):
+        response = self.client.get(reverse("category-list"), {"count": "false"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.json()["count"])
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+import base64
+import json
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.pagination_helper import KeysetPagination
+from main.models import DiaryNote
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteCursorPaginationTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        # few distinct due dates so the id tie breaker is exercised
+        for index in range(25):
+            self.create_note(
+                title=f"note {index}",
+                due_date=date(2023, 10, 1) + timedelta(days=index % 3),
+            )
+
+    def walk(self, url):
+        ids = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in response.json()["results"])
+            url = response.json()["next"]
+        return ids
+
+    def test_cursor_pages_cover_every_note_once(self):
+        url = reverse("note-list") + "?cursor=&sort_by=due_date&page_size=4"
+
+        ids = self.walk(url)
+
+        expected = list(
+            DiaryNote.objects.order_by("due_date", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_cursor_response_has_no_count(self):
+        response = self.client.get(reverse("note-list") + "?cursor=")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.json())
+        self.assertIsNone(response.json()["previous"])
+        self.assertEqual(len(response.json()["results"]), 10)
+
+    def test_previous_cursor_returns_previous_page(self):
+        url = reverse("note-list") + "?cursor=&sort_by=created_date&page_size=5"
+
+        first_page = self.client.get(url).json()
+        second_page = self.client.get(first_page["next"]).json()
+        previous_page = self.client.get(second_page["previous"]).json()
+
+        self.assertEqual(
+            [item["id"] for item in previous_page["results"]],
+            [item["id"] for item in first_page["results"]],
+        )
+        self.assertIsNone(previous_page["previous"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("note-list") + "?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        url = reverse("note-list") + "?cursor=&sort_by=due_date"
+        next_url = self.client.get(url).json()["next"]
+
+        response = self.client.get(next_url.replace("due_date", "created_date"))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor_position_is_rejected(self):
+        for position in (["garbage", 3], ["2023-10-01", "x"], [None, 3], [{}, 3]):
+            payload = {"o": ["due_date", "id"], "p": position, "r": 0}
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+            response = self.client.get(
+                reverse("note-list"), {"cursor": cursor, "sort_by": "due_date"}
+            )
+
+            with self.subTest(position=position):
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deep_page_seeks_on_the_sort_column(self):
+        queryset = (
+            DiaryNote.get_all(user=self.user)
+            .order_by("due_date", "id")
+            .filter(KeysetPagination._after(("due_date", "id"), [date(2023, 10, 2), 5]))
+        )
+
+        plan = queryset.explain()
+
+        if connection.vendor == "postgresql":
+            self.assertRegex(plan, r"Index Cond: .*due_date >=")
+        else:
+            self.assertIn("note_owner_due_date_idx (owner_id=? AND due_date>?)", plan)
@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from main.models import DiaryNote
+from tests.test_main_app.base import SHARED_CACHES, NoteAPITestCase, switch_worker
+
+
+class NoteDetailApiViewTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.note = self.create_note()
+        self.url = reverse("note-detail", kwargs={"note_id": self.note.id})
+
+    def test_get_note(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["id"], self.note.id)
+        self.assertEqual(response.json()["category"]["name"], "Work")
+        self.assertIn("ETag", response.headers)
+
+    def test_cached_note_needs_no_query(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_save_invalidates_cache(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        self.note.title = "new title"
+        self.note.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "new title")
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_profile_change_refreshes_the_cached_note(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        self.user.first_name = "renamed"
+        self.user.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["user"]["first_name"], "renamed")
+
+    def test_category_rename_refreshes_the_cached_note(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Office"
+            self.category.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["category"]["name"], "Office")
+
+    def test_delete_invalidates_cache(self):
+        self.client.get(self.url)
+
+        self.note.delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_users_note(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json().get("message"), "Diary Note record not found")
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class NoteDetailWorkersTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.note = self.create_note()
+        self.url = reverse("note-detail", kwargs={"note_id": self.note.id})
+
+    def test_note_cached_by_another_worker_is_served(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        switch_worker()
+        with mock.patch.object(DiaryNote, "get_note_by_id") as get_note_by_id:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        get_note_by_id.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_through_another_worker_invalidate_the_note(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        switch_worker()
+        with self.captureOnCommitCallbacks(execute=True):
+            DiaryNote.update_note(self.user, self.note.id, title="new title")
+        switch_worker()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "new title")
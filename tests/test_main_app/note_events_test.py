@@ -0,0 +1,207 @@
+import asyncio
+import json
+import threading
+from datetime import date
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_started
+from django.db import close_old_connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from main.helpers.events_helper import (
+    OVERFLOW_EVENT,
+    DisconnectMiddleware,
+    InProcessBroker,
+    RedisBroker,
+    format_event,
+    get_event_broker,
+)
+from main.models import DiaryNote, NoteReminder
+from main.views import stream_events
+from tests.test_main_app.base import NoteTestCase
+
+
+class InProcessBrokerTests(TestCase):
+    async def test_publish_from_another_thread(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe(1)
+        other = broker.subscribe(2)
+
+        thread = threading.Thread(
+            target=broker.publish, args=(1, {"model": "note", "action": "save"})
+        )
+        thread.start()
+        thread.join()
+
+        event = await asyncio.wait_for(subscription.get(), 1)
+        self.assertEqual(event, {"model": "note", "action": "save"})
+        self.assertTrue(other.queue.empty())
+
+    async def test_close_unsubscribes(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe(1)
+        self.assertEqual(broker.subscriber_count(1), 1)
+
+        subscription.close()
+
+        self.assertEqual(broker.subscriber_count(1), 0)
+
+    @override_settings(NOTE_EVENTS_QUEUE_SIZE=2)
+    async def test_slow_subscriber_gets_an_overflow_event(self):
+        broker = InProcessBroker()
+        subscription = broker.subscribe(1)
+
+        for index in range(5):
+            broker.publish(1, {"model": "note", "action": "save", "ids": [index]})
+        await asyncio.sleep(0)
+
+        self.assertEqual(await subscription.get(), OVERFLOW_EVENT)
+        self.assertTrue(subscription.queue.empty())
+
+    def test_format_event(self):
+        event = {"model": "note", "action": "delete", "ids": [3]}
+
+        self.assertEqual(
+            format_event(event),
+            'event: note\ndata: {"model":"note","action":"delete","ids":[3]}\n\n',
+        )
+
+
+@mock.patch("main.helpers.events_helper.redis")
+class RedisBrokerTests(TestCase):
+    def test_publish_goes_through_the_user_channel(self, redis):
+        broker = RedisBroker()
+
+        broker.publish(1, {"model": "note", "action": "save", "ids": [3]})
+
+        redis.Redis.from_url.return_value.publish.assert_called_once_with(
+            "note-events:1", '{"model": "note", "action": "save", "ids": [3]}'
+        )
+
+    async def test_received_events_reach_the_local_subscribers(self, redis):
+        broker = RedisBroker()
+        subscription = broker.subscribe(1)
+        other = broker.subscribe(2)
+        broker.subscribe(1)
+
+        pubsub = redis.Redis.from_url.return_value.pubsub.return_value
+        pubsub.run_in_thread.assert_called_once()
+        handler = pubsub.psubscribe.call_args.kwargs["note-events:*"]
+        handler({"channel": "note-events:1", "data": '{"model": "note"}'})
+
+        self.assertEqual(
+            await asyncio.wait_for(subscription.get(), 1), {"model": "note"}
+        )
+        self.assertTrue(other.queue.empty())
+
+
+class NoteEventStreamTests(NoteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("note-events")
+
+    def create_note(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return super().create_note()
+
+    async def test_stream_requires_a_token(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_sends_note_and_reminder_events(self):
+        token = str(AccessToken.for_user(self.user))
+        response = await self.async_client.get(self.url, {"token": token})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b"retry:"))
+
+        note = await sync_to_async(self.create_note)()
+        frame = (await asyncio.wait_for(anext(stream), 1)).decode()
+        self.assertTrue(frame.startswith("event: note\n"))
+        data = json.loads(frame.split("data: ")[1])
+        self.assertEqual(data, {"model": "note", "action": "save", "ids": [note.id]})
+
+        def create_reminder():
+            with self.captureOnCommitCallbacks(execute=True):
+                return NoteReminder.objects.create(
+                    note=note,
+                    start_date=date(2023, 10, 1),
+                    reminder_interval="Daily",
+                    reminder_message="write it down",
+                )
+
+        reminder = await sync_to_async(create_reminder)()
+        frame = (await asyncio.wait_for(anext(stream), 1)).decode()
+        self.assertIn(
+            f'"model":"reminder","action":"save","ids":[{reminder.id}]', frame
+        )
+
+        await stream.aclose()
+
+    @override_settings(NOTE_EVENTS_HEARTBEAT_INTERVAL=0.01)
+    async def test_idle_stream_sends_keep_alive(self):
+        subscription = get_event_broker().subscribe(self.user.id)
+        stream = stream_events(subscription)
+
+        await anext(stream)
+        self.assertEqual(await anext(stream), ": keep-alive\n\n")
+
+        await stream.aclose()
+        self.assertEqual(get_event_broker().subscriber_count(self.user.id), 0)
+
+    async def test_disconnected_client_is_unsubscribed(self):
+        application = DisconnectMiddleware(ASGIHandler())
+        token = str(AccessToken.for_user(self.user))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": self.url,
+            "query_string": f"token={token}".encode(),
+            "headers": [(b"host", b"testserver")],
+        }
+        messages = asyncio.Queue()
+        messages.put_nowait({"type": "http.request", "body": b""})
+        streaming = asyncio.Event()
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                streaming.set()
+
+        # like the test client, keep the handler off the test's connection
+        request_started.disconnect(close_old_connections)
+        try:
+            request = asyncio.ensure_future(application(scope, messages.get, send))
+            await asyncio.wait_for(streaming.wait(), 1)
+            self.assertEqual(get_event_broker().subscriber_count(self.user.id), 1)
+
+            messages.put_nowait({"type": "http.disconnect"})
+            await asyncio.wait_for(request, 1)
+        finally:
+            request_started.connect(close_old_connections)
+
+        self.assertEqual(get_event_broker().subscriber_count(self.user.id), 0)
+
+    def test_bulk_update_publishes_one_event_per_owner(self):
+        notes = [self.create_note(), self.create_note()]
+
+        with mock.patch.object(get_event_broker(), "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                DiaryNote.update_notes(
+                    DiaryNote.objects.filter(owner=self.user), is_finished=True
+                )
+
+        self.assertEqual(publish.call_count, 1)
+        user_id, event = publish.call_args.args
+        self.assertEqual(user_id, self.user.id)
+        self.assertEqual(sorted(event["ids"]), sorted(note.id for note in notes))
@@ -0,0 +1,206 @@
+from datetime import date
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.filter_helper import plan_note_query
+from main.models import Category
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteFilterTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.health = Category.objects.create(name="Health")
+
+        self.notes = {
+            "work_high": self.create_note(self.category, "High", date(2023, 10, 1)),
+            "work_low_done": self.create_note(
+                self.category, "Low", date(2023, 10, 5), is_finished=True
+            ),
+            "work_low_overdue": self.create_note(
+                self.category, "Low", date(2023, 9, 1), due=True
+            ),
+            "health_high": self.create_note(self.health, "High", date(2023, 10, 9)),
+        }
+
+    def create_note(self, category, priority, due_date, **fields):
+        return super().create_note(
+            category=category, priority=priority, due_date=due_date, **fields
+        )
+
+    def fetch(self, **params):
+        return self.client.get(reverse("note-list"), params)
+
+    def ids(self, *names):
+        return sorted(self.notes[name].id for name in names)
+
+    def fetched_ids(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(item["id"] for item in response.json()["results"])
+
+    def test_filter_by_category(self):
+        response = self.fetch(category=self.category.id)
+
+        self.assertEqual(
+            self.fetched_ids(response),
+            self.ids("work_high", "work_low_done", "work_low_overdue"),
+        )
+
+    def test_filter_by_due_date_range(self):
+        response = self.fetch(due_after="2023-10-01", due_before="2023-10-05")
+
+        self.assertEqual(
+            self.fetched_ids(response), self.ids("work_high", "work_low_done")
+        )
+
+    def test_filters_combine(self):
+        response = self.fetch(category=self.category.id, due_after="2023-10-02")
+
+        self.assertEqual(self.fetched_ids(response), self.ids("work_low_done"))
+
+    def test_filters_combine_with_filter_by(self):
+        response = self.fetch(filter_by="unfinished", priority="High")
+
+        self.assertEqual(
+            self.fetched_ids(response), self.ids("work_high", "health_high")
+        )
+
+    def test_category_combines_with_status_and_priority(self):
+        response = self.fetch(filter_by="unfinished", category=self.category.id)
+        self.assertEqual(
+            self.fetched_ids(response), self.ids("work_high", "work_low_overdue")
+        )
+
+        response = self.fetch(category=self.category.id, priority="Low")
+        self.assertEqual(
+            self.fetched_ids(response), self.ids("work_low_done", "work_low_overdue")
+        )
+
+        for sort_by in ["priority", "created_date"]:
+            response = self.fetch(category=self.category.id, sort_by=sort_by)
+            self.assertEqual(len(self.fetched_ids(response)), 3)
+
+    def test_priority_within_due_date_range(self):
+        response = self.fetch(priority="High", due_before="2023-10-05")
+
+        self.assertEqual(self.fetched_ids(response), self.ids("work_high"))
+
+    def test_overdue_with_status(self):
+        response = self.fetch(filter_by="overdue", is_finished="false")
+
+        self.assertEqual(self.fetched_ids(response), self.ids("work_low_overdue"))
+
+    def test_conflicting_filters(self):
+        response = self.fetch(filter_by="done", is_finished="false")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_date_range(self):
+        response = self.fetch(due_after="2023-10-05", due_before="2023-10-01")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unindexed_combination_is_rejected(self):
+        response = self.fetch(
+            category=self.category.id, priority="Low", sort_by="due_date"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json().get("message"),
+            "This filter and sort combination is not supported",
+        )
+
+    @override_settings(DEBUG=True)
+    def test_index_plan_header(self):
+        response = self.fetch(filter_by="unfinished", sort_by="priority")
+
+        self.assertEqual(
+            response.headers["X-Note-Index-Plan"], "note_finished_prio_rank_idx"
+        )
+
+    def test_index_plan_header_hidden_without_debug(self):
+        response = self.fetch(filter_by="unfinished")
+
+        self.assertNotIn("X-Note-Index-Plan", response.headers)
+
+
+class PlanNoteQueryTests(SimpleTestCase):
+    def assertPlan(self, filters, sort_field, index_name, ordering):
+        plan, plan_ordering = plan_note_query(filters, sort_field=sort_field)
+
+        self.assertIsNotNone(plan)
+        self.assertEqual(plan.name, index_name)
+        self.assertEqual(plan_ordering, ordering)
+
+    def test_plans(self):
+        self.assertPlan({}, None, "note_owner_due_date_idx", ("due_date", "id"))
+        self.assertPlan(
+            {"due": True},
+            "created_at",
+            "note_overdue_created_idx",
+            ("created_at", "id"),
+        )
+        self.assertPlan(
+            {"due": True, "is_finished": False},
+            None,
+            "note_overdue_due_date_idx",
+            ("due_date", "id"),
+        )
+        self.assertPlan(
+            {"priority": "High"}, "priority_rank", "note_owner_prio_rank_idx", ("id",)
+        )
+        self.assertPlan(
+            {"category": 1, "due_after": date(2023, 10, 1)},
+            None,
+            "note_category_due_date_idx",
+            ("due_date", "id"),
+        )
+        self.assertPlan(
+            {"category": 1, "is_finished": False},
+            None,
+            "note_category_finished_due_idx",
+            ("due_date", "id"),
+        )
+        self.assertPlan(
+            {"category": 1, "priority": "High"},
+            None,
+            "note_category_prio_rank_idx",
+            ("id",),
+        )
+        self.assertPlan(
+            {"category": 1},
+            "created_at",
+            "note_category_created_idx",
+            ("created_at", "id"),
+        )
+        self.assertPlan(
+            {"priority": "High", "due_before": date(2023, 10, 1)},
+            None,
+            "note_prio_rank_due_date_idx",
+            ("due_date", "id"),
+        )
+
+    def test_pinned_sort_needs_every_filter_in_the_index(self):
+        # the overdue due date index would leave the priority to a filter and return
+        # the rows in due date order
+        self.assertPlan(
+            {"priority": "High", "due": True},
+            "priority_rank",
+            "note_overdue_prio_rank_idx",
+            ("id",),
+        )
+
+    def test_unservable_plans(self):
+        for filters, sort_field in [
+            ({"due": False}, None),
+            ({"category": 1, "priority": "High"}, "due_date"),
+            ({"is_finished": True, "category": 1}, "priority_rank"),
+            ({"is_finished": True, "priority": "High"}, "due_date"),
+        ]:
+            with self.subTest(filters=filters, sort_field=sort_field):
+                self.assertEqual(
+                    plan_note_query(filters, sort_field=sort_field), (None, None)
+                )
@@ -0,0 +1,125 @@
+from datetime import date
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.cache_helper import SHARED_CACHE_ALIAS, note_list_cache
+from main.helpers.category_helper import category_registry
+from main.models import DiaryNote, NoteReminder
+from tests.test_main_app.base import SHARED_CACHES, NoteAPITestCase, switch_worker
+
+
+class NoteListCacheTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        category_registry.all()
+        self.note = self.create_note(self.user, "first")
+        self.url = reverse("note-list")
+
+        caches[SHARED_CACHE_ALIAS].clear()
+        note_list_cache.reset_stats()
+
+    def create_note(self, owner, title):
+        return super().create_note(owner, title=title)
+
+    def titles(self, response):
+        return [item["title"] for item in response.json()["results"]]
+
+    def test_repeated_page_is_served_from_the_cache(self):
+        first = self.client.get(self.url, {"filter_by": "unfinished"})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {"filter_by": "unfinished"})
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(note_list_cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_query_string_has_its_own_entry(self):
+        self.client.get(self.url)
+        self.client.get(self.url, {"sort_by": "due_date"})
+        self.client.get(self.url, {"page": 1})
+
+        self.assertEqual(note_list_cache.stats(), {"hits": 0, "misses": 3})
+
+    def test_note_writes_make_the_page_stale(self):
+        self.client.get(self.url)
+
+        self.create_note(self.user, "second")
+        response = self.client.get(self.url)
+        self.assertEqual(self.titles(response), ["first", "second"])
+
+        DiaryNote.update_note(self.user, self.note.id, title="renamed")
+        response = self.client.get(self.url)
+        self.assertEqual(self.titles(response), ["renamed", "second"])
+
+        self.assertEqual(note_list_cache.stats(), {"hits": 0, "misses": 3})
+
+    def test_reminder_writes_make_the_page_stale(self):
+        self.client.get(self.url)
+
+        reminder = NoteReminder.objects.create(
+            note=self.note,
+            start_date=date(2023, 10, 1),
+            reminder_interval="Daily",
+            reminder_message="write it down",
+        )
+        self.client.get(self.url)
+
+        NoteReminder.objects.get(id=reminder.id).delete()
+        self.client.get(self.url)
+
+        self.assertEqual(note_list_cache.stats(), {"hits": 0, "misses": 3})
+
+    def test_other_users_writes_keep_the_page(self):
+        self.client.get(self.url)
+
+        self.create_note(self.other_user, "other")
+        self.client.get(self.url)
+
+        self.assertEqual(note_list_cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_pages_are_per_user(self):
+        self.create_note(self.other_user, "other")
+        self.client.get(self.url)
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(self.url)
+
+        self.assertEqual(self.titles(response), ["other"])
+        self.assertEqual(note_list_cache.stats(), {"hits": 0, "misses": 2})
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class NoteListCacheWorkersTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.note = self.create_note(title="first")
+        self.url = reverse("note-list")
+
+        note_list_cache.reset_stats()
+
+    def test_page_cached_by_another_worker_is_served(self):
+        self.client.get(self.url)
+
+        switch_worker()
+        self.client.get(self.url)
+
+        self.assertEqual(note_list_cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_writes_through_another_worker_make_the_page_stale(self):
+        self.client.get(self.url)
+
+        switch_worker()
+        with self.captureOnCommitCallbacks(execute=True):
+            DiaryNote.update_note(self.user, self.note.id, title="renamed")
+        switch_worker()
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            [item["title"] for item in response.json()["results"]], ["renamed"]
+        )
+        self.assertEqual(note_list_cache.stats(), {"hits": 0, "misses": 2})
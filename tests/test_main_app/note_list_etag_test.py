@@ -0,0 +1,109 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.category_helper import category_registry
+from main.models import Category, DiaryNote
+from tests.test_main_app.base import SHARED_CACHES, NoteAPITestCase, switch_worker
+
+
+class NoteListETagTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        category_registry.all()
+        self.note = self.create_note(self.user)
+        self.url = reverse("note-list")
+
+    def create_note(self, owner):
+        with self.captureOnCommitCallbacks(execute=True):
+            return super().create_note(owner)
+
+    def test_unchanged_list_returns_not_modified_without_queries(self):
+        response = self.client.get(self.url)
+        etag = response.headers["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertFalse(response.content)
+
+    def test_query_string_is_part_of_the_etag(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        response = self.client.get(
+            self.url, {"sort_by": "due_date"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_note_writes_change_the_etag(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        self.create_note(self.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DiaryNote.update_note(self.user, self.note.id, title="renamed")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DiaryNote.trash_notes(self.user, [self.note.id])
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_other_users_writes_keep_the_etag(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        self.create_note(self.other_user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_category_list_etag(self):
+        url = reverse("category-list")
+        etag = self.client.get(url).headers["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name="Health")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 2)
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class NoteListETagWorkersTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.note = self.create_note()
+        self.url = reverse("note-list")
+
+    def test_other_workers_keep_the_etag(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        switch_worker()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_other_workers_see_the_write(self):
+        etag = self.client.get(self.url).headers["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DiaryNote.update_note(self.user, self.note.id, title="renamed")
+        switch_worker()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["title"], "renamed")
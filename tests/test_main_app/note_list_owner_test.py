@@ -0,0 +1,32 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteListOwnerTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        for _ in range(3):
+            self.create_note()
+
+    def test_list_does_not_load_the_owner(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("note-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for query in queries.captured_queries:
+            self.assertNotIn("account_user", query["sql"])
+
+    def test_owner_is_returned_once(self):
+        response = self.client.get(reverse("note-list"))
+
+        self.assertEqual(response.data["user"]["email"], self.user.email)
+        self.assertNotIn("password", response.data["user"])
+        self.assertEqual(len(response.data["results"]), 3)
+        for note in response.data["results"]:
+            self.assertNotIn("user", note)
+            self.assertEqual(note["category"]["name"], "Work")
@@ -0,0 +1,88 @@
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from main.helpers.category_helper import category_registry
+from main.helpers.preview_helper import PREVIEW_LENGTH, make_preview
+from main.models import DiaryNote
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NotePreviewTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        category_registry.all()
+
+    def create_note(self, content):
+        return super().create_note(title="Monday", content=content)
+
+    def test_make_preview(self):
+        self.assertEqual(
+            make_preview("  first\n\n line\tand  more "), "first line and more"
+        )
+        self.assertEqual(len(make_preview("word " * 1000)), PREVIEW_LENGTH)
+
+    def test_preview_is_set_on_save(self):
+        note = self.create_note("the meeting\n\nran late")
+        self.assertEqual(note.preview, "the meeting ran late")
+
+        note.content = "rescheduled"
+        note.save(update_fields=["content"])
+
+        note.refresh_from_db()
+        self.assertEqual(note.preview, "rescheduled")
+
+    def test_saving_without_content_keeps_preview(self):
+        note = self.create_note("the meeting ran late")
+
+        listed = DiaryNote.get_all(user=self.user).get(id=note.id)
+        listed.is_finished = True
+        listed.save()
+
+        note.refresh_from_db()
+        self.assertEqual(note.preview, "the meeting ran late")
+        self.assertTrue(note.is_finished)
+
+    def test_update_paths_refresh_preview(self):
+        note = self.create_note("old content")
+
+        updated = DiaryNote.update_note(self.user, note.id, content="new  content")
+        self.assertEqual(updated.preview, "new content")
+
+        notes = DiaryNote.bulk_create_notes(
+            [
+                DiaryNote(
+                    owner=self.user,
+                    title="bulk",
+                    content="bulk\ncontent",
+                    category=self.category,
+                    due_date=date(2023, 10, 1),
+                )
+            ]
+        )
+        self.assertEqual(DiaryNote.objects.get(id=notes[0].id).preview, "bulk content")
+
+    def test_list_returns_preview_without_content(self):
+        self.create_note("a long journal entry " * 50)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("note-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.json()["results"][0]
+        self.assertNotIn("content", result)
+        self.assertEqual(len(result["preview"]), PREVIEW_LENGTH)
+        self.assertNotIn('"content"', queries.captured_queries[-1]["sql"])
+
+    def test_detail_returns_full_content(self):
+        content = "a long journal entry " * 50
+        note = self.create_note(content)
+
+        response = self.client.get(reverse("note-detail", kwargs={"note_id": note.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["content"], content)
+        self.assertNotIn("preview", response.json())
@@ -0,0 +1,55 @@
+from django.urls import reverse
+from rest_framework import status
+
+from main.models import DiaryNote
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NotePrioritySortTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        for priority in ["Medium", "High", "Low", "High", "Low"]:
+            self.create_note(title=f"{priority} note", priority=priority)
+
+    def priorities(self, **params):
+        response = self.client.get(reverse("note-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["priority"] for item in response.json()["results"]]
+
+    def test_sort_by_priority_ascending(self):
+        self.assertEqual(
+            self.priorities(sort_by="priority"),
+            ["Low", "Low", "Medium", "High", "High"],
+        )
+
+    def test_sort_by_priority_descending(self):
+        self.assertEqual(
+            self.priorities(sort_by="priority", sort_order="desc"),
+            ["High", "High", "Medium", "Low", "Low"],
+        )
+
+    def test_sort_by_priority_descending_with_cursor(self):
+        self.assertEqual(
+            self.priorities(sort_by="priority", sort_order="desc", cursor=""),
+            ["High", "High", "Medium", "Low", "Low"],
+        )
+
+    def test_invalid_sort_order(self):
+        response = self.client.get(
+            reverse("note-list"), {"sort_by": "priority", "sort_order": "up"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rank_follows_priority_on_save(self):
+        note = DiaryNote.objects.filter(priority="Low").first()
+
+        note.priority = "High"
+        note.save(update_fields=["priority"])
+
+        note.refresh_from_db()
+        self.assertEqual(note.priority_rank, DiaryNote.PRIORITY_RANKS["High"])
+        self.assertEqual(
+            DiaryNote.get_by_priority(user=self.user, priority="High").count(), 3
+        )
@@ -0,0 +1,85 @@
+from datetime import date
+
+from django.db import connection
+from django.test import TestCase
+
+from main.helpers.filter_helper import plan_note_query
+from main.models import Category, DiaryNote
+from tests.test_main_app.base import create_note, create_user
+
+
+class DiaryNoteQueryPlanTests(TestCase):
+    """
+    Every list query path must be served by an index, both for the filter and the sort
+    """
+
+    sort_fields = [None, "due_date", "priority_rank", "created_at"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.category = Category.objects.create(name="Work")
+        create_note(cls.user, cls.category)
+
+    def query_paths(self):
+        filters = {
+            "all": DiaryNote.get_all(user=self.user),
+            "unfinished": DiaryNote.get_unfinished(user=self.user),
+            "overdue": DiaryNote.fetched_due_notes(user=self.user),
+            "done": DiaryNote.get_by_is_finished(user=self.user, is_finished=True),
+        }
+        for filter_name, queryset in filters.items():
+            for sort_field in self.sort_fields:
+                if sort_field is not None:
+                    queryset = queryset.order_by(sort_field, "id")
+                yield f"{filter_name}/{sort_field}", queryset
+
+        combinations = [
+            ({"category": self.category.id}, None),
+            ({"category": self.category.id, "due_after": date(2023, 10, 1)}, None),
+            ({"category": self.category.id, "is_finished": False}, None),
+            ({"category": self.category.id, "priority": "High"}, None),
+            ({"category": self.category.id}, "priority_rank"),
+            ({"category": self.category.id}, "created_at"),
+            ({"priority": "High", "is_finished": False}, None),
+            ({"priority": "High", "due_before": date(2023, 10, 1)}, None),
+            ({"priority": "High", "due": True}, "priority_rank"),
+            ({"due": True, "is_finished": False}, None),
+            ({"due_before": date(2023, 10, 1), "is_finished": True}, None),
+        ]
+        for filters, sort_field in combinations:
+            plan, ordering = plan_note_query(filters, sort_field=sort_field)
+            if sort_field is not None:
+                # the list sorts on the requested column
+                ordering = (sort_field, "id")
+            queryset = DiaryNote.filter_notes(user=self.user, **filters)
+            yield f"{filters}/{sort_field}", queryset.order_by(*ordering)
+
+        yield "trash", DiaryNote.get_trash(user=self.user).order_by(
+            "-deleted_at", "-id"
+        )
+
+        yield "priority", DiaryNote.get_by_priority(user=self.user, priority="High")
+        yield "due_date", DiaryNote.get_by_due_date(
+            user=self.user, date=date(2023, 10, 1)
+        )
+
+    def assertIndexedPlan(self, name, queryset):
+        table = DiaryNote._meta.db_table
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+            plan = queryset.explain()
+            self.assertNotIn(f"Seq Scan on {table}", plan, f"{name}:\n{plan}")
+            self.assertNotRegex(plan, r"(?<!Incremental )Sort\b", f"{name}:\n{plan}")
+            return
+
+        plan = queryset.explain()
+        self.assertNotRegex(plan, rf"SCAN {table}(?! USING)", f"{name}:\n{plan}")
+        self.assertNotIn("TEMP B-TREE", plan, f"{name}:\n{plan}")
+
+    def test_list_query_paths_use_indexes(self):
+        for name, queryset in self.query_paths():
+            with self.subTest(path=name):
+                self.assertIndexedPlan(name, queryset)
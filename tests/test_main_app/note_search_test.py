@@ -0,0 +1,84 @@
+from django.urls import reverse
+from rest_framework import status
+
+from main.models import DiaryNote
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteSearchTests(NoteAPITestCase):
+    def create_note(self, title, content, owner=None, **fields):
+        return super().create_note(owner, title=title, content=content, **fields)
+
+    def search(self, query, **params):
+        params["q"] = query
+        return self.client.get(reverse("note-list"), params)
+
+    def test_search_matches_title_and_content(self):
+        in_title = self.create_note("Budget meeting", "numbers for next quarter")
+        in_content = self.create_note("Monday", "the meeting ran late")
+        self.create_note("Groceries", "milk and bread")
+
+        response = self.search("meeting")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item["id"] for item in response.json()["results"]]
+        # title matches rank above content matches
+        self.assertEqual(ids, [in_title.id, in_content.id])
+
+    def test_search_returns_highlighted_snippet(self):
+        self.create_note("Monday", "the meeting ran late")
+
+        result = self.search("meeting").json()["results"][0]
+
+        self.assertIn("<mark>meeting</mark>", result["snippet"])
+        self.assertIn("rank", result)
+
+    def test_search_is_scoped_to_the_user(self):
+        self.create_note("Budget meeting", "numbers", owner=self.other_user)
+
+        response = self.search("meeting")
+
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_search_respects_filter_by(self):
+        self.create_note("Budget meeting", "numbers", is_finished=True)
+        unfinished = self.create_note("Team meeting", "agenda")
+
+        response = self.search("meeting", filter_by="unfinished")
+
+        ids = [item["id"] for item in response.json()["results"]]
+        self.assertEqual(ids, [unfinished.id])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        note = self.create_note("Budget meeting", "numbers")
+
+        note.title = "Budget review"
+        note.save()
+        self.assertEqual(self.search("meeting").json()["count"], 0)
+        self.assertEqual(self.search("review").json()["count"], 1)
+
+        note.delete()
+        self.assertEqual(self.search("review").json()["count"], 0)
+
+    def test_search_with_cursor_pagination(self):
+        for index in range(5):
+            self.create_note(f"meeting {index}", "meeting " * index)
+
+        url = reverse("note-list") + "?q=meeting&cursor=&page_size=2"
+        ids = []
+        while url is not None:
+            response = self.client.get(url).json()
+            ids.extend(item["id"] for item in response["results"])
+            url = response["next"]
+
+        self.assertEqual(
+            sorted(ids), list(DiaryNote.objects.values_list("id", flat=True))
+        )
+
+    def test_search_syntax_is_escaped(self):
+        self.create_note("Budget meeting", "numbers")
+
+        response = self.search('meeting" -(*')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
@@ -0,0 +1,85 @@
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from main.models import NoteReminder
+from main.serializers import NoteReminderSerializer
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteSparseFieldsTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.note = self.create_note(content="a long journal entry")
+
+    def test_fields_projection(self):
+        response = self.client.get(
+            reverse("note-list"), {"fields": "id,title,due_date,priority"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.json()["results"][0]),
+            ["id", "title", "priority", "due_date"],
+        )
+
+    def test_fields_projection_narrows_the_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("note-list"), {"fields": "id,title"})
+
+        note_query = queries.captured_queries[-1]["sql"]
+        self.assertNotIn('"content"', note_query)
+        self.assertNotIn('"main_category"', note_query)
+
+    def test_exclude_projection(self):
+        response = self.client.get(
+            reverse("note-list"), {"exclude": "preview,category.created_at"}
+        )
+
+        result = response.json()["results"][0]
+        self.assertNotIn("preview", result)
+        self.assertEqual(result["title"], "note")
+        self.assertNotIn("created_at", result["category"])
+
+    def test_exclude_nested_user_field_is_rejected(self):
+        response = self.client.get(reverse("note-list"), {"exclude": "user.email"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_field(self):
+        response = self.client.get(reverse("note-list"), {"fields": "id,password"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_fields_projection_with_cursor(self):
+        response = self.client.get(
+            reverse("note-list"),
+            {"fields": "id", "cursor": "", "sort_by": "due_date"},
+        )
+
+        self.assertEqual(response.json()["results"], [{"id": self.note.id}])
+
+    def test_nested_reminder_projection(self):
+        reminder = NoteReminder.objects.create(
+            note=self.note,
+            start_date=date(2023, 10, 1),
+            reminder_interval="Daily",
+            reminder_message="message",
+        )
+
+        data = NoteReminderSerializer(
+            reminder, fields=["id", "start_date", "note.title", "note.due_date"]
+        ).data
+
+        self.assertEqual(
+            data,
+            {
+                "id": reminder.id,
+                "start_date": "2023-10-01",
+                "note": {"title": "note", "due_date": "2023-10-01"},
+            },
+        )
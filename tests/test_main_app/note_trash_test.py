@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from main.models import DiaryNote, NoteReminder
+from tests.test_main_app.base import NoteAPITestCase, NoteTestCase
+
+
+class NoteTrashApiViewTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.notes = [self.create_note(self.user, index) for index in range(4)]
+        self.other_note = self.create_note(self.other_user, 4)
+
+    def create_note(self, owner, index):
+        return super().create_note(owner, title=f"note {index}")
+
+    def list_ids(self):
+        response = self.client.get(reverse("note-list"))
+        return sorted(note["id"] for note in response.data["results"])
+
+    def test_bulk_delete_and_restore(self):
+        ids = [self.notes[0].id, self.notes[1].id, self.other_note.id]
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                reverse("note-trash"), {"ids": ids}, format="json"
+            )
+
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(self.list_ids(), [self.notes[2].id, self.notes[3].id])
+        self.assertFalse(DiaryNote.objects.get(id=self.other_note.id).deleted_at)
+
+        response = self.client.get(reverse("note-trash"))
+        self.assertEqual(response.data["count"], 2)
+        self.assertIsNotNone(response.data["results"][0]["deleted_at"])
+
+        response = self.client.post(
+            reverse("note-trash-restore"), {"ids": [self.notes[0].id]}, format="json"
+        )
+
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(
+            self.list_ids(), [self.notes[0].id, self.notes[2].id, self.notes[3].id]
+        )
+
+    def test_delete_moves_to_trash(self):
+        note = self.notes[0]
+        NoteReminder.objects.create(
+            note=note,
+            start_date=date(2023, 10, 1),
+            reminder_interval="Daily",
+            reminder_message="reminder",
+        )
+        detail_url = reverse("note-detail", kwargs={"note_id": note.id})
+        self.client.get(detail_url)
+
+        response = self.client.delete(f"{reverse('note-list')}?note_id={note.id}")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(NoteReminder.objects.filter(note=note).exists())
+        self.assertEqual(
+            self.client.get(detail_url).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+        response = self.client.delete(f"{reverse('note-list')}?note_id={note.id}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_trashed_notes_are_left_out_of_the_helpers(self):
+        DiaryNote.trash_notes(user=self.user, ids=[self.notes[0].id])
+
+        self.assertIsNone(DiaryNote.get_note_by_id(user=self.user, id=self.notes[0].id))
+        self.assertEqual(DiaryNote.get_all(user=self.user).count(), 3)
+        self.assertEqual(DiaryNote.filter_notes(user=self.user).count(), 3)
+        self.assertEqual(DiaryNote.get_unfinished(user=self.user).count(), 3)
+
+    def test_invalid_ids(self):
+        for payload in [{}, {"ids": []}, {"ids": ["a"]}]:
+            response = self.client.post(reverse("note-trash"), payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class NoteTrashPurgeTests(NoteTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.notes = []
+        for index in range(7):
+            note = self.create_note(title=f"note {index}")
+            NoteReminder.objects.create(
+                note=note,
+                start_date=date(2023, 10, 1),
+                reminder_interval="Daily",
+                reminder_message="reminder",
+            )
+            self.notes.append(note)
+
+    def test_purge_expired_trash_in_chunks(self):
+        now = timezone.now()
+        expired = [note.id for note in self.notes[:5]]
+        DiaryNote.objects.filter(id__in=expired).update(
+            deleted_at=now - timedelta(days=40)
+        )
+        DiaryNote.objects.filter(id=self.notes[5].id).update(
+            deleted_at=now - timedelta(days=1)
+        )
+
+        deleted = DiaryNote.purge_trash(
+            deleted_before=now - timedelta(days=30), chunk_size=2
+        )
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(
+            sorted(DiaryNote.objects.values_list("id", flat=True)),
+            [self.notes[5].id, self.notes[6].id],
+        )
+        self.assertEqual(NoteReminder.objects.count(), 2)
@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from main.models import Category
+from tests.test_main_app.base import NoteAPITestCase
+
+
+class NoteUpdateTests(NoteAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.health = Category.objects.create(name="Health")
+
+        self.note = self.create_note(self.user)
+        self.url = f"{reverse('note-list')}?note_id={self.note.id}"
+
+    def test_patch_writes_only_the_sent_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {"title": "new"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["title"], "new")
+        self.assertEqual(response.data["content"], "content")
+        self.assertEqual(response.data["category"]["name"], "Work")
+        self.assertEqual(response.data["user"]["email"], self.user.email)
+
+        updates = [q["sql"] for q in queries.captured_queries if "UPDATE" in q["sql"]]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("RETURNING", updates[0])
+        self.assertNotIn('"content" =', updates[0])
+
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.title, "new")
+
+    def test_put_updates_priority_and_category(self):
+        response = self.client.put(
+            self.url,
+            {
+                "title": "new",
+                "content": "new content",
+                "priority_level": "High",
+                "category": self.health.id,
+                "due_date": "2023-10-01",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["category"]["name"], "Health")
+
+        self.note.refresh_from_db()
+        self.assertEqual(
+            (self.note.content, self.note.priority, self.note.priority_rank),
+            ("new content", "High", 2),
+        )
+        self.assertEqual(self.note.category_id, self.health.id)
+
+    def test_unknown_category(self):
+        response = self.client.patch(self.url, {"category": 999}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], "Category does not exist")
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.category_id, self.category.id)
+
+    def test_other_users_note(self):
+        other_note = self.create_note(self.other_user)
+
+        response = self.client.patch(
+            f"{reverse('note-list')}?note_id={other_note.id}",
+            {"title": "new", "category": self.health.id},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], "Diary Note record not found")
+        other_note.refresh_from_db()
+        self.assertEqual(other_note.title, "note")
+
+    def test_invalid_priority(self):
+        response = self.client.patch(
+            self.url, {"priority_level": "Urgent"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_update_invalidates_the_detail_cache(self):
+        detail_url = reverse("note-detail", kwargs={"note_id": self.note.id})
+        self.client.get(detail_url)
+
+        self.client.patch(self.url, {"title": "new"}, format="json")
+
+        self.assertEqual(self.client.get(detail_url).data["title"], "new")